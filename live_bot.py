@@ -595,6 +595,11 @@ class TradingBot:
             # Calculate features
             df_with_features = self.feature_calc.calculate_indicators(df)
             
+            # Keep the portfolio selector's per-symbol scoring state current
+            # (closed candles only), so rebalances don't recompute indicators
+            if not is_preview and self.portfolio_selector.enabled:
+                self.portfolio_selector.update_bar_state(symbol, df_with_features)
+            
             # Generate primary signal
             primary_signal = self.primary_signal_gen.generate_signal(df_with_features)
             
@@ -656,8 +661,12 @@ class TradingBot:
                     symbol_data = {}
                     for sym in self.trading_symbols:
                         if sym in self.candle_data and len(self.candle_data[sym]) >= 50:
-                            df_with_features_sym = self.feature_calc.calculate_indicators(self.candle_data[sym])
-                            symbol_data[sym] = df_with_features_sym
+                            sym_df = self.candle_data[sym]
+                            if 'timestamp' in sym_df.columns and self.portfolio_selector.has_bar_state(sym, sym_df['timestamp'].iat[-1]):
+                                # Up-to-date incremental state: score without indicators
+                                symbol_data[sym] = None
+                            else:
+                                symbol_data[sym] = self.feature_calc.calculate_indicators(sym_df)
                     
                     selected = self.portfolio_selector.select_symbols(
                         symbol_data=symbol_data,
@@ -887,6 +896,7 @@ class TradingBot:
             
             # Get open positions
             open_positions = self.bybit_client.get_positions()
+            open_symbols = frozenset(pos.get('symbol') for pos in open_positions)
             
             # Calculate position size (with volatility targeting)
             base_position_size = self.risk_manager.calculate_position_size(
@@ -941,7 +951,8 @@ class TradingBot:
                 open_positions=open_positions,
                 symbol=symbol,
                 proposed_size=final_position_size,
-                entry_price=current_price
+                entry_price=current_price,
+                open_symbols=open_symbols
             )
             
             if not is_allowed:
@@ -994,7 +1005,8 @@ class TradingBot:
                                 open_positions=open_positions,
                                 symbol=symbol,
                                 proposed_size=increased_size,
-                                entry_price=current_price
+                                entry_price=current_price,
+                                open_symbols=open_symbols
                             )
                             
                             if is_allowed_increased or "exceeds limit" in reason_increased:
@@ -1454,6 +1466,7 @@ class TradingBot:
         
         finally:
             stream.stop()
+            self.alert_manager.flush(timeout=5.0)
             logger.info("Trading bot stopped")
             
             # Print summary
@@ -1464,6 +1477,8 @@ class TradingBot:
             logger.info(f"Daily PnL: {summary['daily_pnl']:.2f} USDT")
             logger.info(f"Trades: {summary['trade_count']}")
             logger.info(f"Win Rate: {summary['win_rate']:.1f}%")
+            logger.info(f"Sharpe (per trade, last {summary['recent_trades']}): {summary['recent_sharpe']:.2f}")
+            logger.info(f"Max Drawdown: {summary['recent_max_drawdown']:.2f} USDT")
             logger.info("=" * 60)
     
     def stop(self):
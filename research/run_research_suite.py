@@ -262,7 +262,8 @@ class ResearchHarness:
                 time_barrier_hours=labeling_config.get('time_barrier_hours', 24),
                 base_slippage=execution_config.get('base_slippage', 0.0001),
                 include_funding=execution_config.get('include_funding', True),
-                funding_rate=execution_config.get('default_funding_rate', 0.0001)
+                funding_rate=execution_config.get('default_funding_rate', 0.0001),
+                indicators_df=train_data  # Folds are slices of the indicator frame
             )
             
             if features_df.empty:
@@ -310,6 +311,13 @@ class ResearchHarness:
             # Calculate features for test period
             test_df = feature_calc.calculate_indicators(test_data.copy())
             
+            # Row lookups for entries/exits go through plain arrays
+            closes = test_df['close'].to_numpy()
+            if 'timestamp' in test_df.columns:
+                timestamps = test_df['timestamp'].to_numpy()
+            else:
+                timestamps = np.arange(len(test_df))
+            
             # Simulate trades
             for i in range(len(test_df) - 24):  # Need some lookahead
                 current_df = test_df.iloc[:i+1]
@@ -348,9 +356,9 @@ class ResearchHarness:
                     continue
                 
                 # Simulate trade
-                entry_price = test_df.iloc[i+1]['close']
+                entry_price = closes[i+1]
                 exit_idx = min(i + 24, len(test_df) - 1)  # Hold for up to 24 hours
-                exit_price = test_df.iloc[exit_idx]['close']
+                exit_price = closes[exit_idx]
                 
                 # Calculate PnL
                 if primary_signal['direction'] == 'LONG':
@@ -368,8 +376,8 @@ class ResearchHarness:
                 equity += pnl
                 
                 trades.append({
-                    'entry_time': test_df.iloc[i+1].get('timestamp', i),
-                    'exit_time': test_df.iloc[exit_idx].get('timestamp', exit_idx),
+                    'entry_time': timestamps[i+1],
+                    'exit_time': timestamps[exit_idx],
                     'pnl': pnl,
                     'direction': primary_signal['direction'],
                     'confidence': confidence
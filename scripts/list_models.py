@@ -19,7 +19,7 @@ if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
 from src.config.config_loader import load_config
-from src.models.model_registry import list_available_models, select_best_model, get_model_info
+from src.models.model_registry import list_available_models, select_best_model, get_model_info, get_model_metadata
 from loguru import logger
 import argparse
 
@@ -49,7 +49,7 @@ def main():
         print(f"{i}. Model v{model['version']}")
         print(f"   Files exist: {model['exists']}")
         if model['exists']:
-            metadata = model.get('metadata', {})
+            metadata = get_model_metadata(model)
             print(f"   Training Mode: {metadata.get('training_mode', 'unknown')}")
             print(f"   Symbol Encoding: {metadata.get('symbol_encoding_type', 'unknown')}")
             trained_symbols = metadata.get('trained_symbols', [])
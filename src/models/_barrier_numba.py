@@ -0,0 +1,171 @@
+"""Numba-compiled triple-barrier scan used by ModelTrainer.prepare_data"""
+
+import numpy as np
+from typing import Tuple
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    NUMBA_AVAILABLE = False
+
+
+# Barrier codes returned by _triple_barrier_scan
+BARRIER_PROFIT = 0
+BARRIER_LOSS = 1
+BARRIER_TIME = 2
+BARRIER_NAMES = ('profit', 'loss', 'time')
+
+NS_PER_HOUR = 3_600_000_000_000
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, cache=True)
+    def _scan_long(
+        highs, lows, closes, timestamps_ns, entry_indices, entry_prices,
+        profit_barrier, loss_barrier, max_bars, slippage,
+        labels, exit_prices, hold_hours, barrier_hit
+    ):
+        """Triple-barrier scan for LONG entries (profit on highs, loss on lows)"""
+        n_bars = closes.shape[0]
+        use_time = timestamps_ns.shape[0] > 0
+        time_limit = max_bars * NS_PER_HOUR
+
+        for e in prange(entry_indices.shape[0]):
+            k = entry_indices[e]
+            profit_price = entry_prices[e] * (1 + profit_barrier)
+            loss_price = entry_prices[e] * (1 - loss_barrier)
+            exit_factor = 1 - slippage[e]
+            bars = min(max_bars, n_bars - k - 1)
+
+            # Default: time barrier at max bars
+            code = BARRIER_TIME
+            exit_price = closes[k + bars] * exit_factor
+            hold = bars
+
+            for j in range(1, bars + 1):
+                idx = k + j
+                if highs[idx] >= profit_price:
+                    code = BARRIER_PROFIT
+                    exit_price = profit_price * exit_factor
+                    hold = j
+                    break
+                if lows[idx] <= loss_price:
+                    code = BARRIER_LOSS
+                    exit_price = loss_price * exit_factor
+                    hold = j
+                    break
+                if use_time and timestamps_ns[idx] - timestamps_ns[k] >= time_limit:
+                    exit_price = closes[idx] * exit_factor
+                    hold = (timestamps_ns[idx] - timestamps_ns[k]) // NS_PER_HOUR
+                    break
+
+            labels[e] = 1 if code == BARRIER_PROFIT else 0
+            exit_prices[e] = exit_price
+            hold_hours[e] = hold
+            barrier_hit[e] = code
+
+    @njit(parallel=True, cache=True)
+    def _scan_short(
+        highs, lows, closes, timestamps_ns, entry_indices, entry_prices,
+        profit_barrier, loss_barrier, max_bars, slippage,
+        labels, exit_prices, hold_hours, barrier_hit
+    ):
+        """Triple-barrier scan for SHORT entries (profit on lows, loss on highs)"""
+        n_bars = closes.shape[0]
+        use_time = timestamps_ns.shape[0] > 0
+        time_limit = max_bars * NS_PER_HOUR
+
+        for e in prange(entry_indices.shape[0]):
+            k = entry_indices[e]
+            profit_price = entry_prices[e] * (1 - profit_barrier)
+            loss_price = entry_prices[e] * (1 + loss_barrier)
+            exit_factor = 1 + slippage[e]
+            bars = min(max_bars, n_bars - k - 1)
+
+            # Default: time barrier at max bars
+            code = BARRIER_TIME
+            exit_price = closes[k + bars] * exit_factor
+            hold = bars
+
+            for j in range(1, bars + 1):
+                idx = k + j
+                if lows[idx] <= profit_price:
+                    code = BARRIER_PROFIT
+                    exit_price = profit_price * exit_factor
+                    hold = j
+                    break
+                if highs[idx] >= loss_price:
+                    code = BARRIER_LOSS
+                    exit_price = loss_price * exit_factor
+                    hold = j
+                    break
+                if use_time and timestamps_ns[idx] - timestamps_ns[k] >= time_limit:
+                    exit_price = closes[idx] * exit_factor
+                    hold = (timestamps_ns[idx] - timestamps_ns[k]) // NS_PER_HOUR
+                    break
+
+            labels[e] = 1 if code == BARRIER_PROFIT else 0
+            exit_prices[e] = exit_price
+            hold_hours[e] = hold
+            barrier_hit[e] = code
+
+
+def _triple_barrier_scan(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    closes: np.ndarray,
+    timestamps_ns: np.ndarray,
+    entry_indices: np.ndarray,
+    entry_prices: np.ndarray,
+    directions: np.ndarray,
+    profit_barrier: float,
+    loss_barrier: float,
+    max_bars: int,
+    slippage: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Resolve the triple-barrier exit for every entry (requires numba).
+    
+    Semantics match ModelTrainer._triple_barrier_exits: bars are scanned
+    from entry_idx + 1 and, on the same bar, profit wins over loss and
+    both win over the time barrier. LONG and SHORT entries are split by
+    direction and handed to kernels specialized for each side, so the bar
+    loop carries no direction branch.
+    
+    Args:
+        highs, lows, closes: float64 price arrays for the whole series
+        timestamps_ns: int64 nanosecond timestamps (empty to use bar count only)
+        entry_indices: int64 index of each entry bar
+        entry_prices: float64 entry price (slippage already applied)
+        directions: int8 direction per entry (+1 LONG / -1 SHORT)
+        profit_barrier, loss_barrier: Barrier distances as fractions
+        max_bars: Time barrier in hours (and max bars scanned)
+        slippage: float64 exit slippage per entry
+        
+    Returns:
+        Tuple of (labels, exit_prices, hold_hours, barrier_hit_codes)
+    """
+    n_entries = len(entry_indices)
+    labels = np.empty(n_entries, dtype=np.int8)
+    exit_prices = np.empty(n_entries, dtype=np.float64)
+    hold_hours = np.empty(n_entries, dtype=np.int64)
+    barrier_hit = np.empty(n_entries, dtype=np.int8)
+    
+    for kernel, mask in ((_scan_long, directions == 1), (_scan_short, directions != 1)):
+        n_side = int(mask.sum())
+        if n_side == 0:
+            continue
+        out = (
+            np.empty(n_side, dtype=np.int8),
+            np.empty(n_side, dtype=np.float64),
+            np.empty(n_side, dtype=np.int64),
+            np.empty(n_side, dtype=np.int8)
+        )
+        kernel(
+            highs, lows, closes, timestamps_ns, entry_indices[mask], entry_prices[mask],
+            profit_barrier, loss_barrier, max_bars, slippage[mask], *out
+        )
+        labels[mask], exit_prices[mask], hold_hours[mask], barrier_hit[mask] = out
+    
+    return labels, exit_prices, hold_hours, barrier_hit
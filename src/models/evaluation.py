@@ -1,35 +1,61 @@
 """Evaluation and backtesting utilities"""
 
+import math
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple, Optional, Union
 from datetime import datetime, timedelta
+from joblib import Parallel, delayed
 from loguru import logger
 
 
-def calculate_sharpe_ratio(returns: pd.Series, risk_free_rate: float = 0.0) -> float:
+# Per-fold metrics summarised by aggregate_walk_forward_results
+WALK_FORWARD_METRICS = (
+    'sharpe_ratio', 'profit_factor', 'max_drawdown', 'win_rate',
+    'total_return', 'avg_win', 'avg_loss'
+)
+
+
+def calculate_sharpe_ratio(
+    returns: Union[np.ndarray, pd.Series],
+    risk_free_rate: float = 0.0,
+    periods_per_year: Optional[float] = None
+) -> float:
     """
     Calculate Sharpe ratio.
     
     Args:
-        returns: Series of returns
+        returns: Array or Series of returns
         risk_free_rate: Risk-free rate (annualized)
+        periods_per_year: Return periods per year. If None, it is estimated
+            from a DatetimeIndex on returns, defaulting to 365 (daily)
         
     Returns:
         Sharpe ratio (annualized)
     """
-    if len(returns) == 0 or returns.std() == 0:
+    if isinstance(returns, pd.Series):
+        returns_arr = returns.to_numpy(dtype=np.float64)
+    else:
+        returns_arr = np.asarray(returns, dtype=np.float64)
+    
+    if len(returns_arr) < 2:
+        return 0.0
+    
+    std = returns_arr.std(ddof=1)
+    if std == 0:
         return 0.0
     
     # Annualize
-    periods_per_year = 365  # Daily returns
-    if len(returns) > 0:
-        # Estimate frequency from data
-        avg_period = (returns.index[-1] - returns.index[0]).days / len(returns) if len(returns) > 1 else 1
-        periods_per_year = 365 / avg_period
+    if periods_per_year is None:
+        periods_per_year = 365  # Daily returns
+        if isinstance(returns, pd.Series) and isinstance(returns.index, pd.DatetimeIndex):
+            # Estimate frequency from data
+            avg_period = (returns.index[-1] - returns.index[0]).days / len(returns_arr)
+            if avg_period > 0:
+                periods_per_year = 365 / avg_period
     
-    excess_returns = returns.mean() - (risk_free_rate / periods_per_year)
-    sharpe = (excess_returns / returns.std()) * np.sqrt(periods_per_year)
+    excess_returns = returns_arr.mean() - (risk_free_rate / periods_per_year)
+    sharpe = (excess_returns / std) * np.sqrt(periods_per_year)
     
     return float(sharpe)
 
@@ -47,27 +73,32 @@ def calculate_profit_factor(gross_profit: float, gross_loss: float) -> float:
     """
     if gross_loss == 0:
         return float('inf') if gross_profit > 0 else 0.0
-    return float(gross_profit / abs(gross_loss))
+    return float(gross_profit / math.fabs(gross_loss))
 
 
-def calculate_max_drawdown(equity_curve: pd.Series) -> float:
+def calculate_max_drawdown(equity_curve: Union[np.ndarray, pd.Series]) -> float:
     """
     Calculate maximum drawdown.
     
     Args:
-        equity_curve: Series of account equity over time
+        equity_curve: Array or Series of account equity over time
         
     Returns:
         Maximum drawdown (as fraction, e.g., 0.15 for 15%)
     """
-    if len(equity_curve) == 0:
+    if isinstance(equity_curve, pd.Series):
+        equity_arr = equity_curve.to_numpy(dtype=np.float64)
+    else:
+        equity_arr = np.asarray(equity_curve, dtype=np.float64)
+    
+    if len(equity_arr) == 0:
         return 0.0
     
     # Calculate running maximum
-    running_max = equity_curve.expanding().max()
+    running_max = np.maximum.accumulate(equity_arr)
     
     # Calculate drawdown
-    drawdown = (equity_curve - running_max) / running_max
+    drawdown = (equity_arr - running_max) / running_max
     
     return float(abs(drawdown.min()))
 
@@ -99,37 +130,48 @@ def calculate_metrics(
         }
     
     # Calculate equity curve
+    # Cumulative sum over [initial_equity, pnl_0, pnl_1, ...] gives the same
+    # running sums as adding each trade in turn, without boxing Python floats
     trades_sorted = trades.sort_values('exit_time')
-    equity = initial_equity
-    equity_curve = [equity]
-    returns = []
-    
-    for _, trade in trades_sorted.iterrows():
-        equity += trade['pnl']
-        equity_curve.append(equity)
-        returns.append(trade['pnl'] / (equity - trade['pnl']))  # Return on capital
+    pnl = trades_sorted['pnl'].to_numpy(dtype=np.float64)
+    equity_curve = np.cumsum(np.concatenate(([initial_equity], pnl)))
+    equity = float(equity_curve[-1])
+    returns = pnl / equity_curve[:-1]  # Return on capital
     
-    equity_series = pd.Series(equity_curve)
-    returns_series = pd.Series(returns)
+    # Estimate return frequency from trade exit times
+    periods_per_year = None
+    exit_times = trades_sorted['exit_time']
+    if len(trades_sorted) > 1 and pd.api.types.is_datetime64_any_dtype(exit_times):
+        avg_period = (exit_times.iloc[-1] - exit_times.iloc[0]).days / len(trades_sorted)
+        if avg_period > 0:
+            periods_per_year = 365 / avg_period
     
     # Calculate metrics
     total_return = (equity - initial_equity) / initial_equity
-    sharpe = calculate_sharpe_ratio(returns_series)
-    max_dd = calculate_max_drawdown(equity_series)
+    sharpe = calculate_sharpe_ratio(returns, periods_per_year=periods_per_year)
+    max_dd = calculate_max_drawdown(equity_curve)
+    
+    # Win/loss statistics from a single pass over the PnL array
+    win_mask = pnl > 0
+    loss_mask = pnl < 0
+    num_wins = int(np.count_nonzero(win_mask))
+    num_losses = int(np.count_nonzero(loss_mask))
     
     # Win rate
-    winning_trades = trades[trades['pnl'] > 0]
-    losing_trades = trades[trades['pnl'] < 0]
-    win_rate = len(winning_trades) / len(trades) if len(trades) > 0 else 0.0
+    win_rate = num_wins / len(trades)
     
-    # Profit factor
-    gross_profit = winning_trades['pnl'].sum() if len(winning_trades) > 0 else 0.0
-    gross_loss = abs(losing_trades['pnl'].sum()) if len(losing_trades) > 0 else 0.0
-    profit_factor = calculate_profit_factor(gross_profit, gross_loss)
+    # Profit factor (gross_loss is already non-negative, so this inlines
+    # calculate_profit_factor without the abs())
+    gross_profit = float(pnl[win_mask].sum()) if num_wins > 0 else 0.0
+    gross_loss = -float(pnl[loss_mask].sum()) if num_losses > 0 else 0.0
+    if gross_loss > 0:
+        profit_factor = gross_profit / gross_loss
+    else:
+        profit_factor = float('inf') if gross_profit > 0 else 0.0
     
     # Average win/loss
-    avg_win = winning_trades['pnl'].mean() if len(winning_trades) > 0 else 0.0
-    avg_loss = losing_trades['pnl'].mean() if len(losing_trades) > 0 else 0.0
+    avg_win = gross_profit / num_wins if num_wins > 0 else 0.0
+    avg_loss = -gross_loss / num_losses if num_losses > 0 else 0.0
     
     return {
         'total_return': float(total_return),
@@ -140,11 +182,57 @@ def calculate_metrics(
         'avg_win': float(avg_win),
         'avg_loss': float(avg_loss),
         'total_trades': len(trades),
-        'winning_trades': len(winning_trades),
-        'losing_trades': len(losing_trades)
+        'winning_trades': num_wins,
+        'losing_trades': num_losses
     }
 
 
+def _run_fold(
+    fold: int,
+    train_data: pd.DataFrame,
+    test_data: pd.DataFrame,
+    window: Tuple[datetime, datetime, datetime, datetime],
+    train_func,
+    test_func
+) -> Optional[Dict[str, float]]:
+    """
+    Train and test a single walk-forward fold.
+    
+    Args:
+        fold: Fold number
+        train_data: Training slice
+        test_data: Test slice
+        window: (train_start, train_end, test_start, test_end)
+        train_func: Function to train model: train_func(train_data) -> model
+        test_func: Function to test model: test_func(model, test_data) -> metrics_dict
+        
+    Returns:
+        Metrics dictionary with fold metadata, or None if the fold failed
+    """
+    train_start, train_end, test_start, test_end = window
+    
+    try:
+        # Train model
+        logger.info(f"Fold {fold}: Training on {train_start.date()} to {train_end.date()}")
+        model = train_func(train_data)
+        
+        # Test model
+        logger.info(f"Fold {fold}: Testing on {test_start.date()} to {test_end.date()}")
+        metrics = test_func(model, test_data)
+        
+        metrics['fold'] = fold
+        metrics['train_start'] = train_start
+        metrics['train_end'] = train_end
+        metrics['test_start'] = test_start
+        metrics['test_end'] = test_end
+        
+        return metrics
+        
+    except Exception as e:
+        logger.error(f"Error in fold {fold}: {e}")
+        return None
+
+
 def walk_forward_validation(
     data: pd.DataFrame,
     train_func,
@@ -152,11 +240,18 @@ def walk_forward_validation(
     train_window_days: int = 180,
     test_window_days: int = 30,
     step_days: int = 30,
-    min_train_days: int = 90
+    min_train_days: int = 90,
+    n_jobs: int = 1
 ) -> List[Dict[str, float]]:
     """
     Perform walk-forward validation.
     
+    Folds are independent, so they can be run in parallel worker processes
+    with n_jobs != 1. In that case train_func, test_func and the returned
+    metrics must be picklable; the trained models never leave the workers.
+    ModelTrainer.train_model already uses every core for XGBoost, so keep
+    n_jobs=1 when train_func trains one to avoid oversubscription.
+    
     Args:
         data: DataFrame with datetime index and required columns
         train_func: Function to train model: train_func(train_data) -> model
@@ -165,6 +260,7 @@ def walk_forward_validation(
         test_window_days: Test window size in days
         step_days: Step size for rolling forward
         min_train_days: Minimum training data required
+        n_jobs: Number of parallel fold workers (1 = serial, -1 = all cores)
         
     Returns:
         List of metrics dictionaries, one per fold
@@ -176,11 +272,17 @@ def walk_forward_validation(
         else:
             raise ValueError("Data must have timestamp column or DatetimeIndex")
     
-    data = data.sort_values('timestamp').reset_index(drop=True)
-    start_date = data['timestamp'].min()
-    end_date = data['timestamp'].max()
+    # Ingested data is normally already in time order; only sort if needed
+    if data['timestamp'].is_monotonic_increasing:
+        data = data.reset_index(drop=True)
+    else:
+        data = data.sort_values('timestamp').reset_index(drop=True)
+    timestamps = data['timestamp']
+    start_date = timestamps.min()
+    end_date = timestamps.max()
     
-    results = []
+    # Build fold boundaries upfront: (fold, window, row bounds)
+    folds = []
     current_date = start_date
     
     fold = 0
@@ -198,45 +300,47 @@ def walk_forward_validation(
         if test_end > end_date:
             break
         
-        # Extract train and test data
-        train_data = data[
-            (data['timestamp'] >= train_start) & 
-            (data['timestamp'] < train_end)
-        ].copy()
-        
-        test_data = data[
-            (data['timestamp'] >= test_start) & 
-            (data['timestamp'] < test_end)
-        ].copy()
+        # Locate train and test data (timestamps are sorted, so each window
+        # is a contiguous block located by binary search)
+        train_lo, train_hi, test_hi = timestamps.searchsorted(
+            [train_start, train_end, test_end], side='left'
+        )
         
-        if len(train_data) == 0 or len(test_data) == 0:
+        if train_hi == train_lo or test_hi == train_hi:
             current_date += timedelta(days=step_days)
             continue
         
-        try:
-            # Train model
-            logger.info(f"Fold {fold}: Training on {train_start.date()} to {train_end.date()}")
-            model = train_func(train_data)
-            
-            # Test model
-            logger.info(f"Fold {fold}: Testing on {test_start.date()} to {test_end.date()}")
-            metrics = test_func(model, test_data)
-            
-            metrics['fold'] = fold
-            metrics['train_start'] = train_start
-            metrics['train_end'] = train_end
-            metrics['test_start'] = test_start
-            metrics['test_end'] = test_end
-            
-            results.append(metrics)
-            
-        except Exception as e:
-            logger.error(f"Error in fold {fold}: {e}")
+        folds.append((
+            fold,
+            (train_start, train_end, test_start, test_end),
+            (train_lo, train_hi, test_hi)
+        ))
         
         # Roll forward
         current_date += timedelta(days=step_days)
         fold += 1
     
+    fold_args = (
+        (
+            fold,
+            data.iloc[train_lo:train_hi].copy(),
+            data.iloc[train_hi:test_hi].copy(),
+            window,
+            train_func,
+            test_func
+        )
+        for fold, window, (train_lo, train_hi, test_hi) in folds
+    )
+    
+    if n_jobs == 1 or len(folds) <= 1:
+        fold_results = [_run_fold(*args) for args in fold_args]
+    else:
+        fold_results = Parallel(n_jobs=n_jobs, backend='loky')(
+            delayed(_run_fold)(*args) for args in fold_args
+        )
+    
+    results = [metrics for metrics in fold_results if metrics is not None]
+    
     logger.info(f"Walk-forward validation completed: {len(results)} folds")
     return results
 
@@ -254,27 +358,44 @@ def aggregate_walk_forward_results(results: List[Dict[str, float]]) -> Dict[str,
     if not results:
         return {}
     
-    # Extract numeric metrics
-    metrics_to_aggregate = [
-        'sharpe_ratio', 'profit_factor', 'max_drawdown', 'win_rate',
-        'total_return', 'avg_win', 'avg_loss'
-    ]
-    
     aggregated = {}
     
-    for metric in metrics_to_aggregate:
-        values = [r.get(metric, 0.0) for r in results if metric in r]
-        if values:
-            aggregated[f'{metric}_mean'] = float(np.mean(values))
-            aggregated[f'{metric}_std'] = float(np.std(values))
-            aggregated[f'{metric}_min'] = float(np.min(values))
-            aggregated[f'{metric}_max'] = float(np.max(values))
-            aggregated[f'{metric}_median'] = float(np.median(values))
+    # Write every fold's metrics into one preallocated (folds x metrics)
+    # buffer and reduce each statistic in a single vectorized pass. Folds
+    # missing a metric stay NaN and are ignored by the nan-aware reductions.
+    # float32 storage is ample precision for summary statistics; mean/std
+    # still accumulate in float64.
+    num_folds = len(results)
+    values = np.full((num_folds, len(WALK_FORWARD_METRICS)), np.nan, dtype=np.float32)
+    present = np.zeros(len(WALK_FORWARD_METRICS), dtype=bool)
+    total_trades = 0
+    
+    for i, r in enumerate(results):
+        for j, metric in enumerate(WALK_FORWARD_METRICS):
+            if metric in r:
+                values[i, j] = r[metric]
+                present[j] = True
+        total_trades += r.get('total_trades', 0)
+    
+    if present.any():
+        cols = np.flatnonzero(present)
+        values = values[:, cols]
+        stats = {
+            'mean': np.nanmean(values, axis=0, dtype=np.float64),
+            'std': np.nanstd(values, axis=0, dtype=np.float64),
+            'min': np.nanmin(values, axis=0),
+            'max': np.nanmax(values, axis=0),
+            'median': np.nanmedian(values, axis=0),
+        }
+        
+        for i, col in enumerate(cols):
+            metric = WALK_FORWARD_METRICS[col]
+            for stat, reduced in stats.items():
+                aggregated[f'{metric}_{stat}'] = float(reduced[i])
     
     # Total trades
-    total_trades = sum(r.get('total_trades', 0) for r in results)
     aggregated['total_trades'] = total_trades
-    aggregated['num_folds'] = len(results)
+    aggregated['num_folds'] = num_folds
     
     return aggregated
 
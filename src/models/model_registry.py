@@ -6,12 +6,28 @@ and select the best one based on configuration requirements.
 """
 
 import json
+import os
 import re
+import threading
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+from typing import Dict, List, Optional, Any, Tuple
+from datetime import datetime, timezone
 from loguru import logger
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib parser
+    _json_loads = json.loads
+
+
+# Discovery cache: models_dir -> (directory mtime_ns, discovered models).
+# Adding, removing or renaming artifacts bumps the directory mtime, which
+# invalidates the entry.
+_model_cache: Dict[Path, Tuple[int, List[Dict[str, Any]]]] = {}
+_model_cache_lock = threading.Lock()
+
 
 def list_available_models(models_dir: Optional[Path] = None) -> List[Dict[str, Any]]:
     """
@@ -34,6 +50,7 @@ def list_available_models(models_dir: Optional[Path] = None) -> List[Dict[str, A
         - scaler_path: Path to scaler file
         - config_path: Path to config file
         - metadata: Dictionary with training_mode, symbol_encoding_type, trained_symbols, etc.
+          (None until first accessed via get_model_metadata)
         - exists: Whether all required files exist
     """
     if models_dir is None:
@@ -47,89 +64,114 @@ def list_available_models(models_dir: Optional[Path] = None) -> List[Dict[str, A
     
     models_dir.mkdir(exist_ok=True)
     
-    # Find all model files
-    model_files = list(models_dir.glob("meta_model_v*.joblib"))
-    scaler_files = list(models_dir.glob("feature_scaler_v*.joblib"))
-    config_files = list(models_dir.glob("model_config_v*.json"))
+    # Return cached discovery results if the directory has not changed
+    dir_mtime = models_dir.stat().st_mtime_ns
+    with _model_cache_lock:
+        cached = _model_cache.get(models_dir)
+    if cached is not None and cached[0] == dir_mtime:
+        return list(cached[1])
     
-    # Extract versions and group by version
+    # Scan the directory once and classify artifacts by filename
     version_pattern = re.compile(r'v(\d+\.\d+)')
     models_by_version = {}
     
-    # Process model files
-    for model_file in model_files:
-        match = version_pattern.search(model_file.name)
-        if match:
-            version = match.group(1)
-            if version not in models_by_version:
-                models_by_version[version] = {
-                    'version': version,
-                    'model_path': None,
-                    'scaler_path': None,
-                    'config_path': None,
-                    'metadata': {},
-                    'exists': False
-                }
-            models_by_version[version]['model_path'] = model_file
-    
-    # Process scaler files
-    for scaler_file in scaler_files:
-        match = version_pattern.search(scaler_file.name)
-        if match:
+    with os.scandir(models_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if name.startswith('meta_model_v') and name.endswith('.joblib'):
+                key = 'model_path'
+            elif name.startswith('feature_scaler_v') and name.endswith('.joblib'):
+                key = 'scaler_path'
+            elif name.startswith('model_config_v') and name.endswith('.json'):
+                key = 'config_path'
+            else:
+                continue
+            
+            if not entry.is_file():
+                continue
+            
+            match = version_pattern.search(name)
+            if not match:
+                continue
+            
             version = match.group(1)
-            if version not in models_by_version:
-                models_by_version[version] = {
+            model_info = models_by_version.get(version)
+            if model_info is None:
+                model_info = models_by_version[version] = {
                     'version': version,
+                    '_vkey': _version_key(version),
                     'model_path': None,
                     'scaler_path': None,
                     'config_path': None,
-                    'metadata': {},
+                    'metadata': None,  # Parsed on demand by get_model_metadata()
                     'exists': False
                 }
-            models_by_version[version]['scaler_path'] = scaler_file
+            model_info[key] = Path(entry.path)
     
-    # Process config files and load metadata
-    for config_file in config_files:
-        match = version_pattern.search(config_file.name)
-        if match:
-            version = match.group(1)
-            if version not in models_by_version:
-                models_by_version[version] = {
-                    'version': version,
-                    'model_path': None,
-                    'scaler_path': None,
-                    'config_path': None,
-                    'metadata': {},
-                    'exists': False
-                }
-            models_by_version[version]['config_path'] = config_file
-            
-            # Load metadata from config file
-            try:
-                with open(config_file, 'r') as f:
-                    metadata = json.load(f)
-                models_by_version[version]['metadata'] = metadata
-            except Exception as e:
-                logger.warning(f"Could not load metadata from {config_file}: {e}")
-    
-    # Check if all required files exist for each version
+    # All required files were seen by the scan above, so a version is
+    # complete when every path has been filled in
     models = []
     for version, model_info in models_by_version.items():
         model_info['exists'] = (
             model_info['model_path'] is not None and
-            model_info['model_path'].exists() and
             model_info['scaler_path'] is not None and
-            model_info['scaler_path'].exists() and
-            model_info['config_path'] is not None and
-            model_info['config_path'].exists()
+            model_info['config_path'] is not None
         )
         models.append(model_info)
     
     # Sort by version (newest first)
-    models.sort(key=lambda x: _version_key(x['version']), reverse=True)
+    models.sort(key=itemgetter('_vkey'), reverse=True)
+    
+    with _model_cache_lock:
+        _model_cache[models_dir] = (dir_mtime, models)
     
     logger.debug(f"Discovered {len(models)} model version(s) in {models_dir}")
-    return models
+    return list(models)
+
+
+def get_model_metadata(model: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get a model's metadata, loading it from its config file on first access.
+    
+    Most discovered versions are filtered out before their metadata is ever
+    needed, so config files are only parsed for the candidates inspected.
+    
+    Args:
+        model: Model dictionary from list_available_models
+        
+    Returns:
+        Metadata dictionary (empty if the config is missing or unreadable)
+    """
+    metadata = model.get('metadata')
+    if metadata is None:
+        metadata = {}
+        config_file = model.get('config_path')
+        if config_file is not None:
+            try:
+                with open(config_file, 'rb') as f:
+                    metadata = _json_loads(f.read())
+            except Exception as e:
+                logger.warning(f"Could not load metadata from {config_file}: {e}")
+        model['metadata'] = metadata
+    
+    # Parse training_end_timestamp once so model scoring can reuse it
+    if '_training_end_dt' not in model:
+        model['_training_end_dt'] = _parse_training_end(metadata.get('training_end_timestamp'))
+    
+    return metadata
+
+
+def _parse_training_end(training_end: Any) -> Optional[datetime]:
+    """Parse a training_end_timestamp value (ISO string or datetime)"""
+    if not training_end:
+        return None
+    if isinstance(training_end, datetime):
+        return training_end
+    try:
+        return datetime.fromisoformat(str(training_end).replace('Z', '+00:00'))
+    except ValueError as e:
+        logger.debug(f"Could not parse training_end_timestamp: {e}")
+        return None
 
 
 def _version_key(version_str: str) -> tuple:
@@ -185,7 +227,7 @@ def select_best_model(
             logger.debug(f"Model v{model['version']} is incomplete (missing files), skipping")
             continue
         
-        metadata = model.get('metadata', {})
+        metadata = get_model_metadata(model)
         model_training_mode = metadata.get('training_mode', 'single_symbol')
         model_symbol_encoding = metadata.get('symbol_encoding_type', 'one_hot')
         
@@ -212,12 +254,26 @@ def select_best_model(
         logger.debug("No compatible models found")
         return None
     
+    # Nothing to rank when only one model is compatible
+    if len(compatible_models) == 1:
+        best_model = compatible_models[0]
+        best_metadata = get_model_metadata(best_model)
+        logger.info(
+            f"Selected model v{best_model['version']} "
+            f"(training_mode={best_metadata.get('training_mode')}, "
+            f"symbols={len(best_metadata.get('trained_symbols', []))}, "
+            f"only compatible model)"
+        )
+        return best_model
+    
     # Score and rank compatible models
     # Higher score = better match
     scored_models = []
+    now_utc = datetime.now(timezone.utc)
+    now_local = datetime.now()
     
     for model in compatible_models:
-        metadata = model.get('metadata', {})
+        metadata = get_model_metadata(model)
         score = 0
         
         # Prefer models with more trained symbols
@@ -225,22 +281,14 @@ def select_best_model(
         score += len(trained_symbols) * 10
         
         # Prefer newer training_end_timestamp
-        training_end = metadata.get('training_end_timestamp')
-        if training_end:
-            try:
-                # Parse ISO timestamp
-                if isinstance(training_end, str):
-                    end_dt = datetime.fromisoformat(training_end.replace('Z', '+00:00'))
-                else:
-                    end_dt = training_end
-                # Score based on days since training (more recent = higher score)
-                days_ago = (datetime.now(end_dt.tzinfo if hasattr(end_dt, 'tzinfo') else None) - end_dt).days
-                score += max(0, 365 - days_ago)  # Up to 365 points for recency
-            except Exception as e:
-                logger.debug(f"Could not parse training_end_timestamp: {e}")
+        end_dt = model.get('_training_end_dt')
+        if end_dt is not None:
+            # Score based on days since training (more recent = higher score)
+            days_ago = ((now_utc if end_dt.tzinfo is not None else now_local) - end_dt).days
+            score += max(0, 365 - days_ago)  # Up to 365 points for recency
         
         # Prefer higher version number
-        version_key = _version_key(model['version'])
+        version_key = model.get('_vkey') or _version_key(model['version'])
         score += version_key[0] * 100 + version_key[1]  # Major * 100 + minor
         
         scored_models.append((score, model))
@@ -249,10 +297,11 @@ def select_best_model(
     scored_models.sort(key=lambda x: x[0], reverse=True)
     
     best_model = scored_models[0][1]
+    best_metadata = get_model_metadata(best_model)
     logger.info(
         f"Selected model v{best_model['version']} "
-        f"(training_mode={best_model['metadata'].get('training_mode')}, "
-        f"symbols={len(best_model['metadata'].get('trained_symbols', []))}, "
+        f"(training_mode={best_metadata.get('training_mode')}, "
+        f"symbols={len(best_metadata.get('trained_symbols', []))}, "
         f"score={scored_models[0][0]})"
     )
     
@@ -269,7 +318,7 @@ def get_model_info(model: Dict[str, Any]) -> str:
     Returns:
         Formatted string with model information
     """
-    metadata = model.get('metadata', {})
+    metadata = get_model_metadata(model)
     trained_symbols = metadata.get('trained_symbols', [])
     training_end = metadata.get('training_end_timestamp', 'Unknown')
     
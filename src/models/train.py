@@ -1,21 +1,215 @@
 """Model training pipeline"""
 
+import os
 import json
 import joblib
+from joblib import Parallel, delayed, parallel_backend
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Dict, Tuple, List
+from typing import Dict, Tuple, List, Optional
 from datetime import datetime
 from loguru import logger
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import classification_report, roc_auc_score, precision_recall_fscore_support
+from sklearn.metrics import classification_report
 from sklearn.linear_model import LogisticRegression
+from scipy.special import expit
 import xgboost as xgb
-import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+try:
+    import orjson
+    _json_loads = orjson.loads
+    
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY)
+except ImportError:  # orjson is optional; fall back to the stdlib serializer
+    _json_loads = json.loads
+    
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2).encode()
 
 from src.signals.features import FeatureCalculator
 from src.signals.primary_signal import PrimarySignalGenerator
+from src.models._barrier_numba import NUMBA_AVAILABLE, NS_PER_HOUR
+
+if NUMBA_AVAILABLE:
+    from numba import vectorize
+    from src.models._barrier_numba import _triple_barrier_scan
+    
+    @vectorize(['float32(float32, float32, float32)', 'float64(float64, float64, float64)'], cache=True)
+    def _ensemble_combine(xgb_proba, baseline_proba, xgb_weight):
+        """Weighted blend of the two positive-class probabilities (fused loop)"""
+        return xgb_weight * xgb_proba + (1.0 - xgb_weight) * baseline_proba
+else:
+    def _ensemble_combine(xgb_proba, baseline_proba, xgb_weight):
+        """Weighted blend of the two positive-class probabilities"""
+        return xgb_weight * xgb_proba + (1 - xgb_weight) * baseline_proba
+
+
+@contextmanager
+def _exclusive_file_lock(lock_path: Path):
+    """Hold an exclusive OS-level lock on lock_path (blocks until acquired)"""
+    with open(lock_path, 'a+') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class FastScaler:
+    """
+    Minimal z-score feature scaler with the StandardScaler surface used here.
+    
+    Like StandardScaler, NaNs are ignored when fitting and (near) zero-variance
+    features get a scale of 1. Statistics are stored as float32. This class
+    must be defined at module level for proper joblib serialization.
+    """
+    __slots__ = ('mean_', 'scale_')
+    
+    def fit(self, X):
+        """Compute per-feature mean and standard deviation"""
+        X = np.asarray(X)
+        self.mean_ = np.nanmean(X, axis=0, dtype=np.float64).astype(np.float32)
+        scale = np.nanstd(X, axis=0, dtype=np.float64)
+        scale[scale < 10 * np.finfo(np.float64).eps] = 1.0
+        self.scale_ = scale.astype(np.float32)
+        return self
+    
+    def transform(self, X) -> np.ndarray:
+        """Return standardized features as a new ndarray"""
+        return (np.asarray(X) - self.mean_) / self.scale_
+    
+    def fit_transform(self, X) -> np.ndarray:
+        """Fit, then standardize X"""
+        return self.fit(X).transform(X)
+    
+    def transform_inplace(self, X: np.ndarray) -> np.ndarray:
+        """Standardize a float ndarray in place and return it"""
+        np.subtract(X, self.mean_, out=X)
+        np.divide(X, self.scale_, out=X)
+        return X
+
+
+def _classification_metrics(
+    y_true: np.ndarray,
+    proba: np.ndarray,
+    threshold: float = 0.5
+) -> Tuple[float, float, float, float]:
+    """
+    Binary precision, recall, F1 and ROC AUC in one pass over the predictions.
+    
+    Matches precision_recall_fscore_support(average='binary', zero_division=0)
+    on (proba > threshold) and roc_auc_score on proba. The AUC comes from the
+    rank-sum (Mann-Whitney) statistic with tied scores sharing their average
+    rank, so it needs a single sort.
+    
+    Args:
+        y_true: 0/1 labels
+        proba: Positive-class probabilities
+        threshold: Class threshold (proba > threshold is positive)
+        
+    Returns:
+        Tuple of (precision, recall, f1, roc_auc)
+    """
+    y_true = np.asarray(y_true).astype(bool)
+    proba = np.asarray(proba)
+    n_pos = int(y_true.sum())
+    n_neg = len(y_true) - n_pos
+    if n_pos == 0 or n_neg == 0:
+        raise ValueError("Only one class present in y_true. ROC AUC score is not defined in that case.")
+    
+    pred = proba > threshold
+    tp = int(np.count_nonzero(pred & y_true))
+    n_pred = int(np.count_nonzero(pred))
+    precision = tp / n_pred if n_pred else 0.0
+    recall = tp / n_pos
+    f1 = 2 * precision * recall / (precision + recall) if tp else 0.0
+    
+    # Average 1-based rank of each run of tied scores in sorted order
+    order = np.argsort(proba, kind='stable')
+    sorted_proba = proba[order]
+    starts = np.flatnonzero(np.r_[True, sorted_proba[1:] != sorted_proba[:-1]])
+    ends = np.r_[starts[1:], len(sorted_proba)]
+    ranks = np.repeat((starts + ends + 1) / 2.0, ends - starts)
+    pos_rank_sum = ranks[y_true[order]].sum()
+    auc = (pos_rank_sum - n_pos * (n_pos + 1) / 2.0) / (n_pos * n_neg)
+    
+    return precision, recall, f1, float(auc)
+
+
+def _xgb_positive_proba(xgb_model, X) -> np.ndarray:
+    """
+    Positive-class probability from a fitted XGBClassifier.
+    
+    Predicts straight from the numpy array with inplace_predict (no DMatrix
+    is built), limited to the early-stopping best iteration as
+    XGBClassifier.predict_proba does.
+    """
+    try:
+        iteration_range = (0, xgb_model.best_iteration + 1)
+    except AttributeError:
+        iteration_range = (0, 0)
+    return xgb_model.get_booster().inplace_predict(X, iteration_range=iteration_range)
+
+
+def _merge_trained_symbols(new, existing: List[str]) -> List[str]:
+    """Add new symbols to the existing list (never drop previously trained ones)"""
+    existing_symbols = set(existing)
+    new_symbols = set(new) if isinstance(new, list) else {new}
+    merged_symbols = sorted(existing_symbols | new_symbols)
+    added = new_symbols - existing_symbols
+    if added:
+        logger.info(f"Added {len(added)} new symbol(s) to trained_symbols: {sorted(added)}")
+        logger.info(f"Total trained_symbols: {len(merged_symbols)} symbols")
+    else:
+        logger.info(f"trained_symbols unchanged: {len(merged_symbols)} symbols")
+    return merged_symbols
+
+
+def _merge_latest_timestamp(new, existing: Optional[str]) -> str:
+    """Keep the most recent of two ISO timestamps"""
+    new_timestamp = new.isoformat() if hasattr(new, 'isoformat') else str(new)
+    if not existing:
+        return new_timestamp
+    try:
+        new_dt = datetime.fromisoformat(new_timestamp.replace('Z', '+00:00'))
+        existing_dt = datetime.fromisoformat(existing.replace('Z', '+00:00'))
+        return new_timestamp if new_dt > existing_dt else existing
+    except (ValueError, TypeError, AttributeError):
+        return new_timestamp
+
+
+def _merge_dicts(new: Dict, existing: Dict) -> Dict:
+    """Combine per-symbol dictionaries (new values win)"""
+    return {**existing, **new}
+
+
+# Trainer attributes merged into an existing model config by save_model, as
+# (attribute, merge(new_value, existing_value), default when not in the config).
+# Attributes that are unset or empty on the trainer are left out of the config.
+_META_FIELDS = (
+    ('trained_symbols', _merge_trained_symbols, []),
+    ('training_days', max, 0),  # most recent training
+    ('training_end_timestamp', _merge_latest_timestamp, None),
+    ('min_history_days_per_symbol', min, 999999),  # most conservative
+    ('symbol_history_days', _merge_dicts, {}),
+    ('symbol_encoding_map', _merge_dicts, {}),
+)
 
 
 class EnsembleModel:
@@ -31,11 +225,17 @@ class EnsembleModel:
     
     def predict_proba(self, X):
         """Predict probability using weighted ensemble"""
-        xgb_proba = self.xgb_model.predict_proba(X)[:, 1]
-        baseline_proba = self.baseline_model.predict_proba(X)[:, 1]
-        ensemble_proba = self.xgb_weight * xgb_proba + (1 - self.xgb_weight) * baseline_proba
+        # Positive-class probabilities only: the booster's logistic output
+        # (limited to the early-stopping best iteration, as predict_proba does)
+        # and the sigmoid of the logistic regression decision function
+        xgb_proba = _xgb_positive_proba(self.xgb_model, X)
+        baseline_proba = expit(self.baseline_model.decision_function(X))
+        ensemble_proba = _ensemble_combine(xgb_proba, baseline_proba, self.xgb_weight)
         # Return in sklearn format [prob_class_0, prob_class_1]
-        return np.column_stack([1 - ensemble_proba, ensemble_proba])
+        proba = np.empty((len(ensemble_proba), 2))
+        proba[:, 1] = ensemble_proba
+        np.subtract(1.0, ensemble_proba, out=proba[:, 0])
+        return proba
 
 
 class ModelTrainer:
@@ -53,6 +253,8 @@ class ModelTrainer:
         self.primary_signal_gen = PrimarySignalGenerator(config)
         self.training_mode = config.get('model', {}).get('training_mode', 'single_symbol')
         self.symbol_encoding_type = config.get('model', {}).get('symbol_encoding', 'one_hot')
+        # Last indicator frame per symbol: {symbol: (data_fingerprint, indicators_df)}
+        self._indicator_cache: Dict[str, Tuple[tuple, pd.DataFrame]] = {}
         logger.info(f"Initialized ModelTrainer (training_mode={self.training_mode})")
     
     def prepare_data(
@@ -68,7 +270,8 @@ class ModelTrainer:
         time_barrier_hours: int = 24,  # 24 hour time barrier
         base_slippage: float = 0.0001,  # 0.01% base slippage
         include_funding: bool = True,
-        funding_rate: float = 0.0001  # 0.01% per 8 hours (default)
+        funding_rate: float = 0.0001,  # 0.01% per 8 hours (default)
+        indicators_df: Optional[pd.DataFrame] = None
     ) -> Tuple[pd.DataFrame, pd.Series]:
         """
         Prepare training data with labels.
@@ -79,105 +282,151 @@ class ModelTrainer:
             hold_periods: Number of periods to hold position
             profit_threshold: Minimum profit to consider trade successful
             fee_rate: Trading fee rate (per trade)
+            indicators_df: Precomputed calculate_indicators() output for df
+                (optional; skips the indicator pass)
             
         Returns:
             Tuple of (features_df, labels_series)
         """
         logger.info(f"Preparing training data for {symbol}")
         
-        # Calculate indicators
-        df = self.feature_calc.calculate_indicators(df)
+        # Calculate indicators (unless the caller already has them)
+        if indicators_df is not None:
+            df = indicators_df
+        else:
+            df = self._get_indicators(df, symbol)
         
-        # Generate labels by simulating trades
-        labels = []
-        features_list = []
+        # Extract price/time columns once for the barrier search
+        highs = df['high'].to_numpy(dtype=np.float64)
+        lows = df['low'].to_numpy(dtype=np.float64)
+        closes = df['close'].to_numpy(dtype=np.float64)
+        if 'timestamp' in df.columns:
+            # int64 nanoseconds so barrier checks are plain integer arithmetic
+            timestamps_ns = pd.to_datetime(df['timestamp']).to_numpy(dtype='datetime64[ns]').view(np.int64)
+        else:
+            timestamps_ns = None
+        
+        # Primary signals for every bar in one pass
+        # (row i matches what generate_signal returns for df.iloc[:i+1])
+        signals = self.primary_signal_gen.generate_signals_batch(df)
+        signal_codes = signals['direction_code'].to_numpy()
+        
+        # Volatility-adjusted slippage for every bar (needs 20 bars of history)
+        slippages = np.full(len(df), base_slippage, dtype=np.float64)
+        if 'volatility' in df.columns:
+            vol = df['volatility'].to_numpy(dtype=np.float64)
+            vol_ma = df['volatility'].rolling(20).mean().to_numpy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                vol_factor = np.where(vol_ma > 0, vol / vol_ma, 1.0)
+            slippages[20:] = base_slippage * np.maximum(vol_factor[20:], 0.5)  # At least 0.5x
+        
+        # Trade entries: one per non-neutral signal among the candidate bars
+        n_candidates = max(len(df) - max(hold_periods, time_barrier_hours) - 1, 0)
+        entry_rows = np.flatnonzero(signal_codes[:n_candidates])
+        
+        if len(entry_rows) == 0:
+            logger.warning("No training samples generated")
+            return pd.DataFrame(), pd.Series(dtype=int)
         
-        for i in range(len(df) - max(hold_periods, time_barrier_hours) - 1):
-            # Get current state
-            current_df = df.iloc[:i+1]
-            
-            # Generate primary signal
-            primary_signal = self.primary_signal_gen.generate_signal(current_df)
-            
-            if primary_signal['direction'] == 'NEUTRAL':
-                continue
-            
-            # Calculate slippage (volatility-adjusted)
-            if 'volatility' in current_df.columns and len(current_df) > 20:
-                current_vol = current_df['volatility'].iloc[-1]
-                avg_vol = current_df['volatility'].rolling(20).mean().iloc[-1]
-                vol_factor = current_vol / avg_vol if avg_vol > 0 else 1.0
-                slippage = base_slippage * max(vol_factor, 0.5)  # At least 0.5x
-            else:
-                slippage = base_slippage
-            
-            # Entry price with slippage
-            entry_bar = df.iloc[i+1]
-            if primary_signal['direction'] == 'LONG':
-                entry_price = entry_bar['close'] * (1 + slippage)
-            else:  # SHORT
-                entry_price = entry_bar['close'] * (1 - slippage)
-            
+        entry_directions = signal_codes[entry_rows]
+        entry_slippages = slippages[entry_rows]
+        
+        # Entry price with slippage (next bar's close)
+        entry_closes = closes[entry_rows + 1]
+        entry_prices = np.where(
+            entry_directions == 1,
+            entry_closes * (1 + entry_slippages),
+            entry_closes * (1 - entry_slippages)
+        )
+        
+        if use_triple_barrier:
             # Triple-barrier method
-            if use_triple_barrier:
-                label, barrier_hit, exit_price, hold_hours = self._triple_barrier_exit(
-                    df=df,
-                    start_idx=i+1,
-                    entry_price=entry_price,
-                    direction=primary_signal['direction'],
-                    profit_barrier=profit_barrier,
-                    loss_barrier=loss_barrier,
-                    time_barrier_hours=time_barrier_hours,
-                    slippage=slippage
-                )
-            else:
-                # Simple hold-period (backward compatibility)
-                exit_bar = df.iloc[i+1+hold_periods]
-                if primary_signal['direction'] == 'LONG':
-                    exit_price = exit_bar['close'] * (1 - slippage)
-                else:
-                    exit_price = exit_bar['close'] * (1 + slippage)
-                hold_hours = hold_periods
-                barrier_hit = "time"
+            labels = self._triple_barrier_exits(
+                highs=highs,
+                lows=lows,
+                closes=closes,
+                timestamps_ns=timestamps_ns,
+                entry_indices=entry_rows + 1,
+                entry_prices=entry_prices,
+                directions=entry_directions,
+                profit_barrier=profit_barrier,
+                loss_barrier=loss_barrier,
+                time_barrier_hours=time_barrier_hours,
+                slippage=entry_slippages
+            )
+        else:
+            # Simple hold-period (backward compatibility)
+            is_long = entry_directions == 1
+            exit_closes = closes[entry_rows + 1 + hold_periods]
+            exit_prices = np.where(
+                is_long,
+                exit_closes * (1 - entry_slippages),
+                exit_closes * (1 + entry_slippages)
+            )
             
             # Calculate return
-            if primary_signal['direction'] == 'LONG':
-                return_pct = (exit_price - entry_price) / entry_price
-            else:  # SHORT
-                return_pct = (entry_price - exit_price) / entry_price
+            return_pct = np.where(
+                is_long,
+                (exit_prices - entry_prices) / entry_prices,
+                (entry_prices - exit_prices) / entry_prices
+            )
             
             # Account for fees and funding
             net_return = return_pct - (2 * fee_rate)  # Entry + exit fees
             
             # Funding cost (perpetual futures)
             if include_funding:
-                funding_periods = hold_hours / 8  # Funding every 8 hours
+                funding_periods = hold_periods / 8  # Funding every 8 hours
                 funding_cost = funding_rate * funding_periods
                 net_return -= funding_cost
             
-            # Create label (if not using triple-barrier, use threshold)
-            if not use_triple_barrier:
-                label = 1 if net_return > profit_threshold else 0
-            
-            # Build features
-            features = self.feature_calc.build_meta_features(current_df, primary_signal)
-            
-            if features:
-                features_list.append(features)
-                labels.append(label)
+            # Label by threshold
+            labels = (net_return > profit_threshold).astype(np.int8)
         
-        if not features_list:
-            logger.warning("No training samples generated")
-            return pd.DataFrame(), pd.Series(dtype=int)
-        
-        # Convert to DataFrame
-        features_df = pd.DataFrame(features_list)
-        labels_series = pd.Series(labels)
+        # Meta-features for the simulated trades only, built straight into one
+        # float32 block (no full-length feature frame is materialized)
+        features_df = self.feature_calc.build_meta_features_batch(
+            df, signals, rows=entry_rows, dtype=np.float32
+        )
+        features_df.index = pd.RangeIndex(len(features_df))
+        labels_series = pd.Series(labels, dtype=np.int8)
         
         logger.info(f"Generated {len(features_df)} training samples (positive: {labels_series.sum()}, negative: {len(labels_series) - labels_series.sum()})")
         
         return features_df, labels_series
     
+    def _get_indicators(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+        """
+        Calculate indicators, reusing the previous result for the same data.
+        
+        Sweeps over labelling parameters call prepare_data repeatedly with the
+        same candles; only the most recent frame per symbol is kept. The
+        returned frame is shared and must not be modified.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            symbol: Trading symbol (cache key)
+            
+        Returns:
+            DataFrame with indicators
+        """
+        if df.empty or 'timestamp' not in df.columns:
+            return self.feature_calc.calculate_indicators(df)
+        
+        fingerprint = (
+            len(df),
+            df['timestamp'].iloc[0],
+            df['timestamp'].iloc[-1],
+            float(df['close'].iloc[-1])
+        )
+        cached = self._indicator_cache.get(symbol)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        indicators = self.feature_calc.calculate_indicators(df)
+        self._indicator_cache[symbol] = (fingerprint, indicators)
+        return indicators
+    
     def prepare_multi_symbol_data(
         self,
         symbol_dataframes: Dict[str, pd.DataFrame],  # {symbol: df}
@@ -190,13 +439,15 @@ class ModelTrainer:
         time_barrier_hours: int = 24,
         base_slippage: float = 0.0001,
         include_funding: bool = True,
-        funding_rate: float = 0.0001
+        funding_rate: float = 0.0001,
+        n_jobs: int = -1
     ) -> Tuple[pd.DataFrame, pd.Series, Dict[str, List[float]]]:
         """
         Prepare training data from multiple symbols with symbol encoding.
         
         Args:
             symbol_dataframes: Dictionary mapping symbol to DataFrame
+            n_jobs: Number of parallel symbol workers (1 = serial, -1 = all cores)
             (other args same as prepare_data)
             
         Returns:
@@ -205,149 +456,170 @@ class ModelTrainer:
         """
         logger.info(f"Preparing multi-symbol training data for {len(symbol_dataframes)} symbols")
         
-        # Create symbol encoding map
+        # Create symbol encoding map (row i of enc_matrix encodes symbols[i])
         symbols = sorted(symbol_dataframes.keys())
-        symbol_encoding_map = {}
-        
-        if self.symbol_encoding_type == 'one_hot':
-            # One-hot encoding: N symbols -> N-1 features (last symbol is reference)
-            for i, sym in enumerate(symbols):
-                encoding = [0.0] * (len(symbols) - 1)
-                if i < len(symbols) - 1:  # Last symbol is reference (all zeros)
-                    encoding[i] = 1.0
-                symbol_encoding_map[sym] = encoding
-        elif self.symbol_encoding_type == 'index':
+        n_symbols = len(symbols)
+        
+        if self.symbol_encoding_type == 'index':
             # Simple index encoding: symbol index normalized to [0, 1]
-            for i, sym in enumerate(symbols):
-                symbol_encoding_map[sym] = [float(i) / max(len(symbols) - 1, 1)]
+            enc_matrix = (np.arange(n_symbols, dtype=np.float64) / max(n_symbols - 1, 1)).reshape(-1, 1)
         else:
-            # Default: one-hot
-            for i, sym in enumerate(symbols):
-                encoding = [0.0] * (len(symbols) - 1)
-                if i < len(symbols) - 1:
-                    encoding[i] = 1.0
-                symbol_encoding_map[sym] = encoding
+            # One-hot encoding (default): N symbols -> N-1 features (last symbol is reference, all zeros)
+            enc_matrix = np.eye(n_symbols, n_symbols - 1)
+        
+        symbol_index = {sym: i for i, sym in enumerate(symbols)}
+        symbol_encoding_map = {sym: enc_matrix[i].tolist() for i, sym in enumerate(symbols)}
+        enc_columns = [f'symbol_id_{i}' for i in range(enc_matrix.shape[1])]
         
         logger.info(f"Symbol encoding ({self.symbol_encoding_type}): {len(symbol_encoding_map)} symbols, {len(symbol_encoding_map[symbols[0]])} encoding features")
         
-        # Prepare data for each symbol
-        all_features = []
-        all_labels = []
+        # Prepare data for each symbol (symbols are independent)
+        prepare_kwargs = dict(
+            hold_periods=hold_periods,
+            profit_threshold=profit_threshold,
+            fee_rate=fee_rate,
+            use_triple_barrier=use_triple_barrier,
+            profit_barrier=profit_barrier,
+            loss_barrier=loss_barrier,
+            time_barrier_hours=time_barrier_hours,
+            base_slippage=base_slippage,
+            include_funding=include_funding,
+            funding_rate=funding_rate
+        )
         
         for symbol, df in symbol_dataframes.items():
             logger.info(f"Processing {symbol}: {len(df)} candles")
-            
-            # Use existing prepare_data method but add symbol encoding
-            features_df, labels_series = self.prepare_data(
-                df=df,
-                symbol=symbol,
-                hold_periods=hold_periods,
-                profit_threshold=profit_threshold,
-                fee_rate=fee_rate,
-                use_triple_barrier=use_triple_barrier,
-                profit_barrier=profit_barrier,
-                loss_barrier=loss_barrier,
-                time_barrier_hours=time_barrier_hours,
-                base_slippage=base_slippage,
-                include_funding=include_funding,
-                funding_rate=funding_rate
-            )
-            
+        
+        if n_jobs == 1 or len(symbol_dataframes) <= 1:
+            results = [
+                self.prepare_data(df=df, symbol=symbol, **prepare_kwargs)
+                for symbol, df in symbol_dataframes.items()
+            ]
+        else:
+            # One thread per worker so numba/BLAS inside workers don't oversubscribe
+            with parallel_backend('loky', inner_max_num_threads=1):
+                results = Parallel(n_jobs=n_jobs, batch_size=1)(
+                    delayed(self.prepare_data)(df=df, symbol=symbol, **prepare_kwargs)
+                    for symbol, df in symbol_dataframes.items()
+                )
+        
+        symbol_blocks = []
+        for symbol, (features_df, labels_series) in zip(symbol_dataframes, results):
             if features_df.empty:
                 logger.warning(f"No training samples for {symbol}, skipping")
                 continue
-            
-            # Add symbol encoding to features
-            encoding = symbol_encoding_map[symbol]
-            for i, val in enumerate(encoding):
-                features_df[f'symbol_id_{i}'] = val
-            
-            all_features.append(features_df)
-            all_labels.append(labels_series)
+            symbol_blocks.append((symbol, features_df, labels_series))
         
-        if not all_features:
+        if not symbol_blocks:
             logger.error("No training samples generated from any symbol")
             return pd.DataFrame(), pd.Series(dtype=int), {}
         
-        # Combine all features and labels
-        combined_features = pd.concat(all_features, ignore_index=True)
-        combined_labels = pd.concat(all_labels, ignore_index=True)
+        # Combine all features, symbol encodings and labels into one allocation
+        feature_columns = list(symbol_blocks[0][1].columns)
+        n_features = len(feature_columns)
+        total = sum(len(features_df) for _, features_df, _ in symbol_blocks)
+        combined = np.empty((total, n_features + len(enc_columns)), dtype=np.float32)
+        combined_labels = np.empty(total, dtype=np.int8)
+        
+        cur = 0
+        for symbol, features_df, labels_series in symbol_blocks:
+            end = cur + len(features_df)
+            combined[cur:end, :n_features] = features_df.to_numpy(dtype=np.float32, copy=False)
+            combined[cur:end, n_features:] = enc_matrix[symbol_index[symbol]]
+            combined_labels[cur:end] = labels_series.to_numpy()
+            cur = end
+        
+        # Wrap without copying (pandas >= 3 copies ndarray input by default)
+        combined_features = pd.DataFrame(combined, columns=feature_columns + enc_columns, copy=False)
+        combined_labels = pd.Series(combined_labels, copy=False)
         
         logger.info(f"Combined multi-symbol dataset: {len(combined_features)} samples from {len(symbol_dataframes)} symbols")
         logger.info(f"  Positive labels: {combined_labels.sum()}, Negative: {len(combined_labels) - combined_labels.sum()}")
         
         return combined_features, combined_labels, symbol_encoding_map
     
-    def _triple_barrier_exit(
+    def _triple_barrier_exits(
         self,
-        df: pd.DataFrame,
-        start_idx: int,
-        entry_price: float,
-        direction: str,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        closes: np.ndarray,
+        timestamps_ns: Optional[np.ndarray],
+        entry_indices: np.ndarray,
+        entry_prices: np.ndarray,
+        directions: np.ndarray,
         profit_barrier: float,
         loss_barrier: float,
         time_barrier_hours: int,
-        slippage: float
-    ) -> Tuple[int, str, float, int]:
+        slippage: np.ndarray
+    ) -> np.ndarray:
         """
-        Simulate exit using triple-barrier method.
+        Resolve triple-barrier labels for a batch of entries.
         
+        Each entry is scanned from the bar after entry_idx for up to
+        time_barrier_hours bars. The label is 1 when the profit barrier is
+        touched first; on the same bar profit wins over loss, and both win
+        over the time barrier (elapsed time >= time_barrier_hours).
+        
+        Uses the Numba kernels when numba is installed, otherwise one NumPy
+        pass over the (entries x bars) window matrix.
+        
+        Args:
+            highs, lows, closes: Price arrays for the whole series
+            timestamps_ns: int64 nanosecond timestamps (or None to use bar count only)
+            entry_indices: Index of each entry bar
+            entry_prices: Entry price per trade (slippage applied)
+            directions: int8 direction per trade (+1 LONG / -1 SHORT)
+            slippage: Exit slippage per trade
+            
         Returns:
-            Tuple of (label, barrier_hit, exit_price, hold_hours)
+            int8 array of binary labels
         """
-        if direction == 'LONG':
-            profit_price = entry_price * (1 + profit_barrier)
-            loss_price = entry_price * (1 - loss_barrier)
-        else:  # SHORT
-            profit_price = entry_price * (1 - profit_barrier)
-            loss_price = entry_price * (1 + loss_barrier)
-        
-        # Get entry time (if available)
-        if 'timestamp' in df.columns:
-            entry_time = pd.to_datetime(df.iloc[start_idx]['timestamp'])
+        if NUMBA_AVAILABLE:
+            if timestamps_ns is None:
+                timestamps_ns = np.empty(0, dtype=np.int64)
+            labels, _, _, _ = _triple_barrier_scan(
+                highs, lows, closes, timestamps_ns,
+                entry_indices, entry_prices, directions,
+                profit_barrier, loss_barrier, time_barrier_hours, slippage
+            )
+            return labels
+        
+        # Bar index matrix of every entry's holding window; bars past the end
+        # of the series are clamped for the gather and masked out
+        n_bars = len(closes)
+        bar_idx = entry_indices[:, None] + np.arange(1, time_barrier_hours + 1)
+        in_range = bar_idx < n_bars
+        bar_idx = np.minimum(bar_idx, n_bars - 1)
+        window_highs = highs[bar_idx]
+        window_lows = lows[bar_idx]
+        
+        is_long = (directions == 1)[:, None]
+        long_profit = (entry_prices * (1 + profit_barrier))[:, None]
+        long_loss = (entry_prices * (1 - loss_barrier))[:, None]
+        short_profit = (entry_prices * (1 - profit_barrier))[:, None]
+        short_loss = (entry_prices * (1 + loss_barrier))[:, None]
+        
+        hit_profit = in_range & np.where(is_long, window_highs >= long_profit, window_lows <= short_profit)
+        hit_loss = in_range & np.where(is_long, window_lows <= long_loss, window_highs >= short_loss)
+        
+        # First hit bar per entry (time_barrier_hours + 1 = never hit)
+        not_hit = time_barrier_hours + 1
+        
+        def first_hit(hits: np.ndarray) -> np.ndarray:
+            return np.where(hits.any(axis=1), hits.argmax(axis=1) + 1, not_hit)
+        
+        first_profit = first_hit(hit_profit)
+        first_loss = first_hit(hit_loss)
+        
+        # Time barrier (if timestamps available)
+        if timestamps_ns is not None:
+            elapsed = timestamps_ns[bar_idx] - timestamps_ns[entry_indices][:, None]
+            first_time = first_hit(in_range & (elapsed >= time_barrier_hours * NS_PER_HOUR))
         else:
-            entry_time = None
-        
-        max_bars = min(time_barrier_hours, len(df) - start_idx - 1)
+            first_time = np.full(len(entry_indices), not_hit)
         
-        for j in range(1, max_bars + 1):
-            if start_idx + j >= len(df):
-                break
-            
-            bar = df.iloc[start_idx + j]
-            
-            # Check profit barrier
-            if direction == 'LONG':
-                if bar['high'] >= profit_price:
-                    exit_price = profit_price * (1 - slippage)  # Exit with slippage
-                    return 1, "profit", exit_price, j
-                elif bar['low'] <= loss_price:
-                    exit_price = loss_price * (1 - slippage)
-                    return 0, "loss", exit_price, j
-            else:  # SHORT
-                if bar['low'] <= profit_price:
-                    exit_price = profit_price * (1 + slippage)
-                    return 1, "profit", exit_price, j
-                elif bar['high'] >= loss_price:
-                    exit_price = loss_price * (1 + slippage)
-                    return 0, "loss", exit_price, j
-            
-            # Check time barrier (if timestamps available)
-            if entry_time is not None and 'timestamp' in df.columns:
-                try:
-                    bar_time = pd.to_datetime(bar['timestamp'])
-                    if isinstance(bar_time, pd.Timestamp) and isinstance(entry_time, pd.Timestamp):
-                        hours_elapsed = (bar_time - entry_time).total_seconds() / 3600
-                        if hours_elapsed >= time_barrier_hours:
-                            exit_price = bar['close'] * (1 - slippage if direction == 'LONG' else 1 + slippage)
-                            return 0, "time", exit_price, int(hours_elapsed)
-                except:
-                    pass  # Fall back to bar count
-        
-        # Time barrier hit (reached max bars)
-        last_bar = df.iloc[start_idx + max_bars]
-        exit_price = last_bar['close'] * (1 - slippage if direction == 'LONG' else 1 + slippage)
-        return 0, "time", exit_price, max_bars
+        profit_first = (first_profit < not_hit) & (first_profit <= first_loss) & (first_profit <= first_time)
+        return profit_first.astype(np.int8)
     
     def train_model(
         self,
@@ -356,7 +628,7 @@ class ModelTrainer:
         test_size: float = 0.2,
         validation_size: float = 0.2,
         use_ensemble: bool = True
-    ) -> Tuple[any, StandardScaler, Dict]:
+    ) -> Tuple[any, FastScaler, Dict]:
         """
         Train meta-model.
         
@@ -371,35 +643,51 @@ class ModelTrainer:
         """
         logger.info("Training meta-model")
         
+        # Single precision is plenty for these features and halves the memory
+        # traffic of scaling and histogram building (no-op if already float32)
+        features_df = features_df.astype(np.float32, copy=False)
+        
         # Time-based split (critical for time-series data)
         # Use first 60% for training, next 20% for validation, last 20% for test
         total_size = len(features_df)
         train_end = int(total_size * (1 - test_size - validation_size))
         val_end = int(total_size * (1 - test_size))
         
-        X_train = features_df.iloc[:train_end]
-        y_train = labels.iloc[:train_end]
-        
-        X_val = features_df.iloc[train_end:val_end]
-        y_val = labels.iloc[train_end:val_end]
+        # One float32 copy of the features, scaled in place; the splits are
+        # row-slice views of it and models receive raw ndarrays
+        X = features_df.to_numpy(dtype=np.float32, copy=True)
+        y = labels.to_numpy(dtype=np.int8)
         
-        X_test = features_df.iloc[val_end:]
-        y_test = labels.iloc[val_end:]
+        y_train = y[:train_end]
+        y_val = y[train_end:val_end]
+        y_test = y[val_end:]
         
-        logger.info(f"Train: {len(X_train)}, Val: {len(X_val)}, Test: {len(X_test)}")
+        logger.info(f"Train: {train_end}, Val: {val_end - train_end}, Test: {total_size - val_end}")
         
-        # Scale features
-        scaler = StandardScaler()
-        X_train_scaled = scaler.fit_transform(X_train)
-        X_val_scaled = scaler.transform(X_val)
-        X_test_scaled = scaler.transform(X_test)
+        # Scale features (statistics from the training split only)
+        scaler = FastScaler().fit(X[:train_end])
+        scaler.transform_inplace(X)
+        X_train_scaled = X[:train_end]
+        X_val_scaled = X[train_end:val_end]
+        X_test_scaled = X[val_end:]
         
         # Train XGBoost model
         # Note: In XGBoost 2.0+, early_stopping_rounds must be in constructor, not fit()
+        # With tree_method='hist' the sklearn wrapper bins the training data into a
+        # QuantileDMatrix once and reuses its bin edges for the eval set.
+        # XGBoost threads internally (n_jobs=-1): don't also run several
+        # train_model calls in parallel worker processes.
+        use_gpu = self.config.get('model', {}).get('use_gpu', False)
         xgb_model = xgb.XGBClassifier(
             n_estimators=100,
             max_depth=5,
             learning_rate=0.1,
+            tree_method='hist',
+            grow_policy='lossguide',
+            max_leaves=32,
+            max_bin=256,
+            device='cuda' if use_gpu else 'cpu',
+            n_jobs=-1,
             subsample=0.8,
             colsample_bytree=0.8,
             random_state=42,
@@ -414,19 +702,18 @@ class ModelTrainer:
             verbose=False
         )
         
-        # Evaluate XGBoost
-        xgb_pred = xgb_model.predict(X_test_scaled)
-        xgb_pred_proba = xgb_model.predict_proba(X_test_scaled)[:, 1]
+        # Evaluate XGBoost (one prediction pass; class = proba > 0.5 as in predict()).
+        # The probabilities are reused below for the ensemble metrics.
+        xgb_pred_proba = _xgb_positive_proba(xgb_model, X_test_scaled)
         
-        xgb_precision, xgb_recall, xgb_f1, _ = precision_recall_fscore_support(y_test, xgb_pred, average='binary', zero_division=0)
-        xgb_auc = roc_auc_score(y_test, xgb_pred_proba)
+        xgb_precision, xgb_recall, xgb_f1, xgb_auc = _classification_metrics(y_test, xgb_pred_proba)
         
         metrics = {
             'xgb_precision': float(xgb_precision),
             'xgb_recall': float(xgb_recall),
             'xgb_f1_score': float(xgb_f1),
             'xgb_roc_auc': float(xgb_auc),
-            'test_samples': len(X_test),
+            'test_samples': len(X_test_scaled),
             'positive_rate': float(y_test.mean())
         }
         
@@ -445,11 +732,10 @@ class ModelTrainer:
             baseline_model.fit(X_train_scaled, y_train)
             
             # Evaluate baseline
-            baseline_pred = baseline_model.predict(X_test_scaled)
-            baseline_pred_proba = baseline_model.predict_proba(X_test_scaled)[:, 1]
+            # One decision_function pass (predict_proba is its sigmoid)
+            baseline_pred_proba = expit(baseline_model.decision_function(X_test_scaled))
             
-            baseline_precision, baseline_recall, baseline_f1, _ = precision_recall_fscore_support(y_test, baseline_pred, average='binary', zero_division=0)
-            baseline_auc = roc_auc_score(y_test, baseline_pred_proba)
+            baseline_precision, baseline_recall, baseline_f1, baseline_auc = _classification_metrics(y_test, baseline_pred_proba)
             
             metrics.update({
                 'baseline_precision': float(baseline_precision),
@@ -464,12 +750,11 @@ class ModelTrainer:
             ensemble_weight = self.config.get('model', {}).get('ensemble_xgb_weight', 0.7)
             model = EnsembleModel(xgb_model, baseline_model, xgb_weight=ensemble_weight)
             
-            # Evaluate ensemble
-            ensemble_pred_proba = model.predict_proba(X_test_scaled)[:, 1]
-            ensemble_pred = (ensemble_pred_proba > 0.5).astype(int)
+            # Evaluate ensemble from the test predictions above (same blend as
+            # EnsembleModel.predict_proba, without predicting again)
+            ensemble_pred_proba = _ensemble_combine(xgb_pred_proba, baseline_pred_proba, model.xgb_weight)
             
-            ensemble_precision, ensemble_recall, ensemble_f1, _ = precision_recall_fscore_support(y_test, ensemble_pred, average='binary', zero_division=0)
-            ensemble_auc = roc_auc_score(y_test, ensemble_pred_proba)
+            ensemble_precision, ensemble_recall, ensemble_f1, ensemble_auc = _classification_metrics(y_test, ensemble_pred_proba)
             
             metrics.update({
                 'ensemble_precision': float(ensemble_precision),
@@ -487,7 +772,7 @@ class ModelTrainer:
     def save_model(
         self,
         model: any,
-        scaler: StandardScaler,
+        scaler: FastScaler,
         metrics: Dict,
         features_df: pd.DataFrame,
         version: str = "1.0"
@@ -508,140 +793,60 @@ class ModelTrainer:
         model_dir = project_root / "models"
         model_dir.mkdir(exist_ok=True)
         
-        # Save model
+        # Save model (zlib level 3 and pickle protocol 5; joblib.load
+        # decompresses transparently, so loaders are unchanged)
         model_path = model_dir / f"meta_model_v{version}.joblib"
-        joblib.dump(model, model_path)
+        joblib.dump(model, model_path, compress=3, protocol=5)
         logger.info(f"Saved model to {model_path}")
         
         # Save scaler
         scaler_path = model_dir / f"feature_scaler_v{version}.joblib"
-        joblib.dump(scaler, scaler_path)
+        joblib.dump(scaler, scaler_path, compress=3, protocol=5)
         logger.info(f"Saved scaler to {scaler_path}")
         
-        # Load existing config to merge metadata (if it exists)
-        # Use file locking to prevent race conditions when multiple threads save simultaneously
-        existing_config = {}
+        # Merge with the existing config under an exclusive OS-level lock so
+        # concurrent saves of the same version don't drop each other's
+        # metadata (the lock blocks in the kernel; no polling)
         config_path = model_dir / f"model_config_v{version}.json"
-        
-        # Try to acquire lock and read existing config
-        # Use a lock file approach for cross-platform compatibility
         lock_path = model_dir / f".model_config_v{version}.lock"
-        max_lock_attempts = 30
-        lock_acquired = False
-        lock_file = None
         
-        for attempt in range(max_lock_attempts):
-            try:
-                # Try to create lock file atomically
-                try:
-                    lock_file = open(str(lock_path), 'x')  # 'x' mode = exclusive creation, fails if exists
-                    lock_acquired = True
-                    break
-                except FileExistsError:
-                    # Lock file exists, another process is writing
-                    if attempt < max_lock_attempts - 1:
-                        time.sleep(0.1 * min(attempt + 1, 5))  # Exponential backoff, max 0.5s
-                        continue
-                    else:
-                        logger.warning(f"Could not acquire lock after {max_lock_attempts} attempts, proceeding without merge (may cause race condition)")
-                        break
-            except Exception as e:
-                logger.warning(f"Error acquiring lock (attempt {attempt + 1}): {e}")
-                if attempt < max_lock_attempts - 1:
-                    time.sleep(0.1 * min(attempt + 1, 5))
-                    continue
-                else:
-                    break
-        
-        # Read existing config if lock acquired or if no lock needed
-        if lock_acquired or not lock_path.exists():
+        with _exclusive_file_lock(lock_path):
+            existing_config = {}
             if config_path.exists():
                 try:
-                    with open(config_path, 'r') as f:
-                        existing_config = json.load(f)
+                    with open(config_path, 'rb') as f:
+                        existing_config = _json_loads(f.read())
                     logger.debug(f"Loaded existing model config for merging: {len(existing_config.get('trained_symbols', []))} symbols")
                 except Exception as e:
                     logger.warning(f"Could not read existing config: {e}")
-        
-        # Save config with model coverage metadata
-        # Use datetime.now() instead of datetime.utcnow() (utcnow is deprecated in Python 3.12+)
-        from datetime import timezone as tz
-        config = {
-            'version': version,
-            'training_date': datetime.now(tz.utc).isoformat(),
-            'features': list(features_df.columns),
-            'performance': metrics,
-            'training_mode': self.training_mode,
-            'symbol_encoding_type': self.symbol_encoding_type
-        }
-        
-        # Merge trained_symbols: add new symbols to existing list (don't overwrite)
-        existing_trained_symbols = set(existing_config.get('trained_symbols', []))
-        if hasattr(self, 'trained_symbols') and self.trained_symbols:
-            new_symbols = set(self.trained_symbols) if isinstance(self.trained_symbols, list) else {self.trained_symbols}
-            merged_symbols = sorted(list(existing_trained_symbols | new_symbols))
-            config['trained_symbols'] = merged_symbols
-            if new_symbols - existing_trained_symbols:
-                logger.info(f"Added {len(new_symbols - existing_trained_symbols)} new symbol(s) to trained_symbols: {sorted(new_symbols - existing_trained_symbols)}")
-                logger.info(f"Total trained_symbols: {len(merged_symbols)} symbols")
-            else:
-                logger.info(f"trained_symbols unchanged: {len(merged_symbols)} symbols")
-        
-        # Merge training_days: use maximum (most recent training)
-        if hasattr(self, 'training_days') and self.training_days:
-            existing_days = existing_config.get('training_days', 0)
-            config['training_days'] = max(self.training_days, existing_days)
-        
-        # Merge training_end_timestamp: use most recent
-        if hasattr(self, 'training_end_timestamp') and self.training_end_timestamp:
-            new_timestamp = self.training_end_timestamp.isoformat() if hasattr(self.training_end_timestamp, 'isoformat') else str(self.training_end_timestamp)
-            existing_timestamp = existing_config.get('training_end_timestamp')
-            if existing_timestamp:
-                # Compare timestamps and use most recent
-                try:
-                    # Use datetime from module-level import (already imported at top)
-                    new_dt = datetime.fromisoformat(new_timestamp.replace('Z', '+00:00'))
-                    existing_dt = datetime.fromisoformat(existing_timestamp.replace('Z', '+00:00'))
-                    config['training_end_timestamp'] = new_timestamp if new_dt > existing_dt else existing_timestamp
-                except:
-                    config['training_end_timestamp'] = new_timestamp
-            else:
-                config['training_end_timestamp'] = new_timestamp
-        
-        # Merge min_history_days_per_symbol: use minimum (most conservative)
-        if hasattr(self, 'min_history_days_per_symbol') and self.min_history_days_per_symbol:
-            existing_min = existing_config.get('min_history_days_per_symbol', 999999)
-            config['min_history_days_per_symbol'] = min(self.min_history_days_per_symbol, existing_min)
-        
-        # Merge per-symbol history days: combine dictionaries
-        if hasattr(self, 'symbol_history_days') and self.symbol_history_days:
-            existing_symbol_history = existing_config.get('symbol_history_days', {})
-            merged_history = {**existing_symbol_history, **self.symbol_history_days}
-            config['symbol_history_days'] = merged_history
-            logger.info(f"Updated per-symbol history days: {len(merged_history)} symbols")
-        
-        # Merge symbol encoding map: combine dictionaries (for multi-symbol models)
-        if hasattr(self, 'symbol_encoding_map') and self.symbol_encoding_map:
-            existing_encoding_map = existing_config.get('symbol_encoding_map', {})
-            merged_encoding_map = {**existing_encoding_map, **self.symbol_encoding_map}
-            config['symbol_encoding_map'] = merged_encoding_map
-            logger.info(f"Updated symbol encoding map: {len(merged_encoding_map)} symbols")
-        
-        # Write config (we hold the lock if acquired)
-        try:
-            with open(config_path, 'w') as f:
-                json.dump(config, f, indent=2)
-            logger.info(f"Saved config to {config_path}")
-        except Exception as e:
-            logger.error(f"Failed to save config: {e}")
-            raise
-        finally:
-            # Always release lock
-            if lock_acquired and lock_file:
-                try:
-                    lock_file.close()
-                    if lock_path.exists():
-                        lock_path.unlink()
-                except Exception as e:
-                    logger.warning(f"Could not release lock file: {e}")
-
+            
+            # Save config with model coverage metadata
+            # Use datetime.now() instead of datetime.utcnow() (utcnow is deprecated in Python 3.12+)
+            from datetime import timezone as tz
+            config = {
+                'version': version,
+                'training_date': datetime.now(tz.utc).isoformat(),
+                'features': features_df.columns.tolist(),
+                'performance': metrics,
+                'training_mode': self.training_mode,
+                'symbol_encoding_type': self.symbol_encoding_type
+            }
+            
+            # Merge coverage metadata into the existing config (see _META_FIELDS)
+            for name, merge, existing_default in _META_FIELDS:
+                value = getattr(self, name, None)
+                if value:
+                    config[name] = merge(value, existing_config.get(name, existing_default))
+                    if isinstance(config[name], dict):
+                        logger.info(f"Updated {name}: {len(config[name])} symbols")
+            
+            # Write config atomically (readers never see a partial file)
+            tmp_path = config_path.with_suffix('.json.tmp')
+            try:
+                with open(tmp_path, 'wb') as f:
+                    f.write(_json_dumps(config))
+                os.replace(tmp_path, config_path)
+                logger.info(f"Saved config to {config_path}")
+            except Exception as e:
+                logger.error(f"Failed to save config: {e}")
+                raise
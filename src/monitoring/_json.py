@@ -0,0 +1,48 @@
+"""JSON encoding for monitoring output (trade logs, status file, alerts)"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode datetimes and numpy values the way orjson does; anything else as str"""
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    return str(obj)
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize obj to UTF-8 JSON bytes.
+    
+    datetimes are written as ISO 8601 strings (same as .isoformat()) and
+    numpy scalars/arrays as plain numbers/lists, so callers can pass them
+    through without converting.
+    
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2-space indentation
+    
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=_default, option=option)
+    return json.dumps(obj, indent=2 if indent else None, default=_default).encode()
+
+
+def loads(data: bytes) -> Any:
+    """Parse a JSON document from bytes (or str)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
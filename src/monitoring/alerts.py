@@ -1,11 +1,47 @@
 """Alerting system for trading bot events"""
 
-import json
+import time
+import math
+import threading
+from collections import OrderedDict
+from itertools import islice
+from queue import Queue, Full
 import requests
-from typing import Dict, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Optional, Any, Tuple
 from datetime import datetime
 from loguru import logger
 
+from src.monitoring._json import dumps
+
+
+# Max alerts waiting for delivery; beyond this, alerts are coalesced into
+# per-(event_type, severity) counts
+ALERT_QUEUE_SIZE = 1024
+
+# Max distinct (event_type, message) pairs remembered for deduplication
+DEDUP_CACHE_SIZE = 256
+
+# Discord embed styling per severity
+SEVERITY_EMOJI = {
+    "CRITICAL": "🔴",
+    "WARNING": "🟡",
+    "INFO": "🔵"
+}
+SEVERITY_COLOR = {
+    "CRITICAL": 15158332,  # Red
+    "WARNING": 16776960,   # Yellow
+    "INFO": 3447003        # Blue
+}
+DEFAULT_EMOJI = "⚪"
+DEFAULT_COLOR = 9807270  # Gray
+
+# Discord embed limits (longer names/values make the webhook reject the message)
+DISCORD_MAX_FIELDS = 25
+DISCORD_FIELD_NAME_LIMIT = 256
+DISCORD_FIELD_VALUE_LIMIT = 1024
+
 
 class AlertManager:
     """Manage alerts and notifications"""
@@ -30,6 +66,46 @@ class AlertManager:
         self.alert_on_model_rotation = alerts_config.get('alert_on_model_rotation', True)
         self.alert_on_health_issues = alerts_config.get('alert_on_health_issues', True)
         
+        # Flood control
+        self.rate_limit_per_minute = alerts_config.get('rate_limit_per_minute', 5)
+        self.rate_limit_burst = alerts_config.get('rate_limit_burst', 10)
+        self.dedup_window_seconds = alerts_config.get('dedup_window_seconds', 60)
+        self._buckets: Dict[Tuple[str, str], Tuple[float, float]] = {}  # key -> (tokens, last refill)
+        # (event_type, message) -> [last sent (monotonic), suppressed since], oldest first
+        self._recent: "OrderedDict[Tuple[str, str], list]" = OrderedDict()
+        self._throttle_lock = threading.Lock()
+        
+        # Per-event-type alert gate (HEALTH_* prefix and CRITICAL severity are
+        # handled in notify_event)
+        self._event_gate = {
+            "PERFORMANCE_GUARD_PAUSED": self.alert_on_pause,
+            "KILL_SWITCH": self.alert_on_kill_switch,
+            "MODEL_ROTATION": self.alert_on_model_rotation
+        }
+        
+        # One pooled keep-alive session for all webhook POSTs. Transient
+        # failures (including Discord 429s, honoring Retry-After) are retried
+        # on the worker thread.
+        self._session = requests.Session()
+        retry = Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset({'POST'}),
+            respect_retry_after_header=True
+        )
+        self._session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=retry))
+        
+        # Delivery happens on a background worker so notify_event never blocks
+        # the trading loop on network I/O
+        self._queue: Queue = Queue(maxsize=ALERT_QUEUE_SIZE)
+        self._overflow: Dict[Tuple[str, str], int] = {}
+        self._overflow_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        if self.enabled:
+            self._worker = threading.Thread(target=self._worker_loop, name="AlertManager", daemon=True)
+            self._worker.start()
+        
         logger.info(f"Initialized AlertManager (enabled={self.enabled})")
     
     def notify_event(
@@ -61,22 +137,22 @@ class AlertManager:
             return
         
         # Check if this event type should trigger alerts
-        should_alert = False
-        if event_type == "PERFORMANCE_GUARD_PAUSED" and self.alert_on_pause:
-            should_alert = True
-        elif event_type == "KILL_SWITCH" and self.alert_on_kill_switch:
-            should_alert = True
-        elif event_type == "MODEL_ROTATION" and self.alert_on_model_rotation:
-            should_alert = True
-        elif event_type.startswith("HEALTH_") and self.alert_on_health_issues:
-            should_alert = True
-        elif severity == "CRITICAL":
-            should_alert = True
+        should_alert = (
+            severity == "CRITICAL"
+            or self._event_gate.get(event_type, False)
+            or (self.alert_on_health_issues and event_type.startswith("HEALTH_"))
+        )
         
         if not should_alert:
             return
         
-        # Send to configured channels
+        suppressed_count = self._throttle(event_type, message, severity)
+        if suppressed_count is None:
+            return
+        if suppressed_count:
+            context = {**(context or {}), 'suppressed_count': suppressed_count}
+        
+        # Queue for delivery to configured channels
         alert_data = {
             'event_type': event_type,
             'message': message,
@@ -85,6 +161,112 @@ class AlertManager:
             'context': context or {}
         }
         
+        try:
+            self._queue.put_nowait(alert_data)
+        except Full:
+            # Coalesce instead of blocking; the worker sends one summary per key
+            key = (event_type, severity)
+            with self._overflow_lock:
+                self._overflow[key] = self._overflow.get(key, 0) + 1
+    
+    def _throttle(self, event_type: str, message: str, severity: str) -> Optional[int]:
+        """
+        Apply deduplication and rate limiting to an alert.
+        
+        An identical (event_type, message) alert within dedup_window_seconds of
+        the last one sent is suppressed; otherwise the alert needs a token from
+        the (event_type, severity) bucket (rate_limit_per_minute, burst
+        rate_limit_burst). Suppressed alerts are counted and reported on the
+        next identical alert that goes out.
+        
+        Returns:
+            None to suppress, else the number of identical alerts suppressed
+            since the last one sent
+        """
+        now = time.monotonic()
+        key = (event_type, message)
+        with self._throttle_lock:
+            entry = self._recent.get(key)
+            if entry is not None and now - entry[0] < self.dedup_window_seconds:
+                entry[1] += 1
+                return None
+            
+            bucket_key = (event_type, severity)
+            tokens, last_refill = self._buckets.get(bucket_key, (self.rate_limit_burst, now))
+            tokens = min(self.rate_limit_burst, tokens + (now - last_refill) * self.rate_limit_per_minute / 60)
+            if tokens < 1:
+                self._buckets[bucket_key] = (tokens, now)
+                if entry is None:
+                    entry = self._recent[key] = [-math.inf, 0]
+                entry[1] += 1
+                self._evict_recent()
+                return None
+            self._buckets[bucket_key] = (tokens - 1, now)
+            
+            suppressed_count = entry[1] if entry is not None else 0
+            self._recent[key] = [now, 0]
+            self._recent.move_to_end(key)
+            self._evict_recent()
+            return suppressed_count
+    
+    def _evict_recent(self):
+        """Bound the dedup cache (caller holds _throttle_lock)."""
+        while len(self._recent) > DEDUP_CACHE_SIZE:
+            self._recent.popitem(last=False)
+    
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait for queued alerts to be delivered.
+        
+        Args:
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            True if the queue drained within timeout
+        """
+        if self._worker is None:
+            return True
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Alert flush timed out with {self._queue.unfinished_tasks} alert(s) pending")
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+    
+    def _worker_loop(self):
+        """Deliver queued alerts (runs on the background worker thread)."""
+        while True:
+            alert_data = self._queue.get()
+            try:
+                self._dispatch(alert_data)
+                self._dispatch_overflow()
+            except Exception as e:
+                logger.error(f"Error delivering alert: {e}")
+            finally:
+                self._queue.task_done()
+    
+    def _dispatch_overflow(self):
+        """Send one summary alert per (event_type, severity) dropped while the queue was full."""
+        with self._overflow_lock:
+            if not self._overflow:
+                return
+            overflow, self._overflow = self._overflow, {}
+        
+        for (event_type, severity), count in overflow.items():
+            logger.warning(f"Alert queue full: coalesced {count} {event_type} alert(s)")
+            self._dispatch({
+                'event_type': event_type,
+                'message': f"{count} further {event_type} alert(s) coalesced (alert queue full)",
+                'severity': severity,
+                'timestamp': datetime.utcnow().isoformat(),
+                'context': {'coalesced_count': count}
+            })
+    
+    def _dispatch(self, alert_data: Dict[str, Any]):
+        """Send alert to all configured channels."""
         # Discord webhook
         if self.discord_webhook_url:
             self._send_discord_alert(alert_data)
@@ -97,40 +279,33 @@ class AlertManager:
         """Send alert to Discord webhook."""
         try:
             # Format Discord message
-            severity_emoji = {
-                "CRITICAL": "🔴",
-                "WARNING": "🟡",
-                "INFO": "🔵"
-            }.get(alert_data['severity'], "⚪")
+            severity = alert_data['severity']
+            context = alert_data['context'] or {}
             
             embed = {
-                "title": f"{severity_emoji} {alert_data['event_type']}",
+                "title": f"{SEVERITY_EMOJI.get(severity, DEFAULT_EMOJI)} {alert_data['event_type']}",
                 "description": alert_data['message'],
-                "color": {
-                    "CRITICAL": 15158332,  # Red
-                    "WARNING": 16776960,   # Yellow
-                    "INFO": 3447003        # Blue
-                }.get(alert_data['severity'], 9807270),  # Gray
+                "color": SEVERITY_COLOR.get(severity, DEFAULT_COLOR),
                 "timestamp": alert_data['timestamp'],
-                "fields": []
-            }
-            
-            # Add context fields
-            if alert_data['context']:
-                for key, value in alert_data['context'].items():
-                    embed['fields'].append({
-                        "name": key,
-                        "value": str(value),
+                # Context fields, truncated to Discord's limits
+                "fields": [
+                    {
+                        "name": str(key)[:DISCORD_FIELD_NAME_LIMIT],
+                        "value": str(value)[:DISCORD_FIELD_VALUE_LIMIT],
                         "inline": True
-                    })
+                    }
+                    for key, value in islice(context.items(), DISCORD_MAX_FIELDS)
+                ]
+            }
             
             payload = {
                 "embeds": [embed]
             }
             
-            response = requests.post(
+            response = self._session.post(
                 self.discord_webhook_url,
-                json=payload,
+                data=dumps(payload),
+                headers={"Content-Type": "application/json"},
                 timeout=5
             )
             response.raise_for_status()
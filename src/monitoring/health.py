@@ -1,12 +1,63 @@
 """Health check and monitoring for trading bot"""
 
+import os
 import json
+import mmap
 import time
+import struct
+import hashlib
+import numpy as np
 from pathlib import Path
-from typing import Dict, Optional, Any
-from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Any
+from datetime import datetime, timedelta, timezone
 from loguru import logger
 
+from src.monitoring._json import dumps, loads
+
+
+# Fixed size of the memory-mapped status snapshot file: a header of
+# (sequence number, payload length) followed by the status JSON. The
+# sequence number is odd while a write is in progress.
+STATUS_SNAPSHOT_SIZE = 65536
+_SNAPSHOT_HEADER = struct.Struct('<QI')
+
+
+def read_status_snapshot(buf) -> Optional[Dict[str, Any]]:
+    """
+    Read the latest status from a mapped status snapshot.
+    
+    Pollers (e.g. a dashboard) map the .snapshot file next to the status
+    file once, with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), and
+    call this on every poll to get updates without reopening the file.
+    
+    Args:
+        buf: Mapped snapshot (any buffer laid out as written by HealthMonitor)
+        
+    Returns:
+        Status dictionary, or None if no status has been written yet or the
+        latest one did not fit in the snapshot (read the status file then)
+    """
+    for _ in range(100):
+        seq, length = _SNAPSHOT_HEADER.unpack_from(buf, 0)
+        if seq == 0:
+            return None
+        if seq % 2:
+            time.sleep(0)  # Writer mid-update
+            continue
+        start = _SNAPSHOT_HEADER.size
+        data = bytes(buf[start:start + length])
+        # Retry if the writer started another update while we copied
+        if _SNAPSHOT_HEADER.unpack_from(buf, 0)[0] == seq:
+            return loads(data)
+    return None
+
+
+def _epoch_seconds(ts: datetime) -> float:
+    """POSIX seconds for a datetime (naive values are UTC, as utcnow() returns)"""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
 
 class HealthMonitor:
     """Monitor bot health and generate status reports"""
@@ -25,10 +76,17 @@ class HealthMonitor:
         
         # State tracking
         self.last_candle_time = {}
+        # Same data as parallel arrays (symbols in first-seen order, epoch
+        # seconds with NaN = unknown) so check_health computes every feed gap
+        # in one vector op
+        self._candle_symbols: List[str] = []
+        self._candle_index: Dict[str, int] = {}
+        self._last_candle_ts = np.empty(0, dtype=np.float64)
         self.last_trade_time = None
+        self._last_trade_ts: Optional[float] = None  # epoch seconds
         self.last_health_check = None
         self.api_error_count = 0
-        self.api_error_window_start = None
+        self.api_error_window_start = None  # time.monotonic() seconds
         
         # Thresholds from config
         ops_config = config.get('operations', {})
@@ -43,6 +101,22 @@ class HealthMonitor:
         # The bot uses hourly candles ("60" = 60 minutes), so we default to that
         self.candle_interval_minutes = 60  # Default to hourly candles
         
+        # Memoized check_health result: repeated calls with the same inputs
+        # within status_cache_ttl seconds return the cached status. Feed,
+        # trade and API error updates invalidate it.
+        self.status_cache_ttl = self.health_check_interval / 10
+        self._cached_status: Optional[Dict[str, Any]] = None
+        self._cached_key: Optional[tuple] = None
+        self._cached_at: Optional[float] = None  # time.monotonic() seconds
+        self._cached_status_json: Optional[bytes] = None
+        self._last_status_digest: Optional[bytes] = None
+        
+        # Memory-mapped copy of the latest status for polling readers (see
+        # read_status_snapshot); the JSON file stays the durable copy
+        self.snapshot_path = self.status_file_path.with_suffix('.snapshot')
+        self._snapshot: Optional[mmap.mmap] = None
+        self._snapshot_seq = 0
+        
         logger.info(f"Initialized HealthMonitor (status file: {self.status_file_path})")
     
     def update_candle(self, symbol: str, timestamp: datetime):
@@ -54,6 +128,15 @@ class HealthMonitor:
             timestamp: Candle timestamp
         """
         self.last_candle_time[symbol] = timestamp
+        
+        idx = self._candle_index.get(symbol)
+        if idx is None:
+            idx = len(self._candle_symbols)
+            self._candle_index[symbol] = idx
+            self._candle_symbols.append(symbol)
+            self._last_candle_ts = np.append(self._last_candle_ts, np.nan)
+        self._last_candle_ts[idx] = _epoch_seconds(timestamp) if timestamp else np.nan
+        self._cached_at = None
     
     def update_trade(self, timestamp: datetime):
         """
@@ -63,18 +146,21 @@ class HealthMonitor:
             timestamp: Trade timestamp
         """
         self.last_trade_time = timestamp
+        self._last_trade_ts = _epoch_seconds(timestamp) if timestamp else None
+        self._cached_at = None
     
     def record_api_error(self):
         """Record an API error occurrence."""
-        now = datetime.utcnow()
+        now = time.monotonic()
         
         # Reset window if too old
         if self.api_error_window_start is None or \
-           (now - self.api_error_window_start).total_seconds() > self.api_error_window_minutes * 60:
+           now - self.api_error_window_start > self.api_error_window_minutes * 60:
             self.api_error_count = 0
             self.api_error_window_start = now
         
         self.api_error_count += 1
+        self._cached_at = None
     
     def check_health(
         self,
@@ -97,9 +183,29 @@ class HealthMonitor:
         Returns:
             Dictionary with health status
         """
-        now = datetime.utcnow()
+        # Interval math runs on float seconds: the monotonic clock for the
+        # cache TTL, epoch seconds for candle/trade ages. datetime is only
+        # built for the user-facing timestamp.
+        now_mono = time.monotonic()
+        now_s = time.time()
+        now = datetime.fromtimestamp(now_s, timezone.utc).replace(tzinfo=None)
         self.last_health_check = now
         
+        key = (
+            bot_running,
+            len(open_positions),
+            performance_guard_status.get('status'),
+            self.api_error_count,
+            regime_info.get('regime') if regime_info else None,
+            (model_info.get('version'), model_info.get('age_days')) if model_info else None
+        )
+        if (
+            self._cached_at is not None
+            and key == self._cached_key
+            and now_mono - self._cached_at < self.status_cache_ttl
+        ):
+            return self._cached_status
+        
         status = {
             'timestamp': now.isoformat(),
             'bot_running': bot_running,
@@ -122,14 +228,13 @@ class HealthMonitor:
             tolerance_minutes = max(5, expected_gap_minutes * 0.1)  # 10% tolerance or 5 minutes minimum
             max_allowed_gap = expected_gap_minutes + tolerance_minutes
             
-            for symbol, last_time in self.last_candle_time.items():
-                if last_time:
-                    gap_minutes = (now - last_time).total_seconds() / 60
-                    # Only flag as stalled if gap exceeds expected interval + tolerance
-                    if gap_minutes > max_allowed_gap:
-                        status['issues'].append(f"Data feed stalled for {symbol}: {gap_minutes:.1f} minutes (expected: ~{expected_gap_minutes:.0f} min)")
-                        status['health_status'] = 'DEGRADED'
-                        data_feed_ok = False
+            # Only flag as stalled if gap exceeds expected interval + tolerance
+            # (unknown times are NaN and never compare greater)
+            gaps_minutes = (now_s - self._last_candle_ts) / 60
+            for idx in np.flatnonzero(gaps_minutes > max_allowed_gap):
+                status['issues'].append(f"Data feed stalled for {self._candle_symbols[idx]}: {gaps_minutes[idx]:.1f} minutes (expected: ~{expected_gap_minutes:.0f} min)")
+                status['health_status'] = 'DEGRADED'
+                data_feed_ok = False
         
         # Check API errors
         if self.api_error_count >= self.max_api_errors:
@@ -137,8 +242,9 @@ class HealthMonitor:
             status['health_status'] = 'DEGRADED'
         
         # Check trading activity
-        if self.last_trade_time:
-            hours_since_trade = (now - self.last_trade_time).total_seconds() / 3600
+        hours_since_trade = None
+        if self._last_trade_ts is not None:
+            hours_since_trade = (now_s - self._last_trade_ts) / 3600
             if hours_since_trade > self.max_no_trade_hours:
                 status['warnings'].append(f"No trades in {hours_since_trade:.1f} hours")
         else:
@@ -148,7 +254,7 @@ class HealthMonitor:
         status['metrics'] = {
             'open_positions': len(open_positions),
             'performance_guard_status': performance_guard_status.get('status', 'UNKNOWN'),
-            'last_trade_hours_ago': (now - self.last_trade_time).total_seconds() / 3600 if self.last_trade_time else None,
+            'last_trade_hours_ago': hours_since_trade,
             'api_error_count': self.api_error_count,
             'data_feed_ok': data_feed_ok
         }
@@ -167,28 +273,95 @@ class HealthMonitor:
             if any('stalled' in issue.lower() or 'error' in issue.lower() for issue in status['issues']):
                 status['health_status'] = 'UNHEALTHY'
         
+        self._cached_status = status
+        self._cached_key = key
+        self._cached_at = now_mono
+        self._cached_status_json = None
+        
         return status
     
     def write_status_file(self, status: Dict[str, Any]):
         """
         Write status to JSON file.
         
+        The file is replaced atomically (temp file + os.replace) so readers
+        never see a partial write, and skipped when the content is unchanged
+        since the last write. The same bytes are published to the
+        memory-mapped snapshot first.
+        
         Args:
             status: Health status dictionary
         """
         try:
-            with open(self.status_file_path, 'w') as f:
-                json.dump(status, f, indent=2, default=str)
+            # Serialize a memoized check_health result only once
+            if status is self._cached_status:
+                if self._cached_status_json is None:
+                    self._cached_status_json = dumps(status, indent=True)
+                data = self._cached_status_json
+            else:
+                data = dumps(status, indent=True)
+            digest = hashlib.blake2b(data, digest_size=16).digest()
+            if digest == self._last_status_digest:
+                return
+            
+            self._write_snapshot(data)
+            
+            tmp_path = self.status_file_path.with_suffix('.tmp')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.status_file_path)
+            self._last_status_digest = digest
         except Exception as e:
             logger.error(f"Error writing status file: {e}")
     
+    def _write_snapshot(self, data: bytes):
+        """
+        Publish serialized status to the memory-mapped snapshot (no fsync).
+        
+        Args:
+            data: Status JSON bytes
+        """
+        if _SNAPSHOT_HEADER.size + len(data) > STATUS_SNAPSHOT_SIZE:
+            logger.warning(f"Status ({len(data)} bytes) exceeds snapshot size, only the status file is updated")
+            if self._snapshot is not None:
+                # Invalidate the stale payload so readers fall back to the file
+                self._snapshot_seq = 0
+                _SNAPSHOT_HEADER.pack_into(self._snapshot, 0, 0, 0)
+            return
+        
+        if self._snapshot is None:
+            fd = os.open(self.snapshot_path, os.O_RDWR | os.O_CREAT)
+            try:
+                os.ftruncate(fd, STATUS_SNAPSHOT_SIZE)
+                self._snapshot = mmap.mmap(fd, STATUS_SNAPSHOT_SIZE)
+            finally:
+                os.close(fd)
+            # Start a new sequence (readers treat 0 as "nothing written")
+            self._snapshot[:_SNAPSHOT_HEADER.size] = bytes(_SNAPSHOT_HEADER.size)
+        
+        # Odd sequence while the payload is being replaced
+        self._snapshot_seq += 1
+        struct.pack_into('<Q', self._snapshot, 0, self._snapshot_seq)
+        start = _SNAPSHOT_HEADER.size
+        self._snapshot[start:start + len(data)] = data
+        self._snapshot_seq += 1
+        _SNAPSHOT_HEADER.pack_into(self._snapshot, 0, self._snapshot_seq, len(data))
+    
     def get_status(self) -> Optional[Dict[str, Any]]:
         """
-        Read current status from file.
+        Read current status (from the snapshot if this monitor has
+        published one, otherwise from the status file).
         
         Returns:
             Status dictionary or None if file doesn't exist
         """
+        if self._snapshot is not None:
+            status = read_status_snapshot(self._snapshot)
+            if status is not None:
+                return status
+        
         if not self.status_file_path.exists():
             return None
         
@@ -1,11 +1,19 @@
 """Trade logging and PnL tracking"""
 
-import json
+import atexit
+import threading
+import numpy as np
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple, BinaryIO
 from loguru import logger
 
+from src.monitoring._json import dumps
+
+
+# Number of most recent trade PnLs kept for rolling statistics
+PNL_HISTORY_SIZE = 10_000
+
 
 class TradeLogger:
     """Log trading activity and track PnL"""
@@ -31,6 +39,19 @@ class TradeLogger:
         self.trade_count = 0
         self.win_count = 0
         
+        # Ring buffer of the last PNL_HISTORY_SIZE trade PnLs (oldest slot at
+        # _pnl_idx once full) so get_summary computes rolling stats without
+        # re-reading the JSONL logs
+        self._pnl_buf = np.zeros(PNL_HISTORY_SIZE, dtype=np.float64)
+        self._pnl_idx = 0
+        self._pnl_n = 0
+        
+        # One unbuffered append handle per log directory (one write per event), reopened when the
+        # UTC date rolls over: {log_dir: (date, file)}
+        self._open_files: Dict[Path, Tuple[str, BinaryIO]] = {}
+        self._files_lock = threading.Lock()
+        atexit.register(self.close)
+        
         logger.info("Initialized TradeLogger")
     
     def log_signal(
@@ -42,7 +63,7 @@ class TradeLogger:
     ):
         """Log signal generation"""
         event = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.utcnow(),
             'event': 'SIGNAL_GENERATED',
             'symbol': symbol,
             'direction': direction,
@@ -64,7 +85,7 @@ class TradeLogger:
     ):
         """Log order placement"""
         event = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.utcnow(),
             'event': 'ORDER_PLACED',
             'symbol': symbol,
             'side': side,
@@ -90,7 +111,7 @@ class TradeLogger:
     ):
         """Log completed trade"""
         event = {
-            'timestamp': exit_time.isoformat(),
+            'timestamp': exit_time,
             'event': 'TRADE_CLOSED',
             'symbol': symbol,
             'side': side,
@@ -99,8 +120,8 @@ class TradeLogger:
             'qty': qty,
             'pnl': pnl,
             'pnl_pct': (pnl / (entry_price * qty)) * 100 if entry_price * qty > 0 else 0,
-            'entry_time': entry_time.isoformat(),
-            'exit_time': exit_time.isoformat(),
+            'entry_time': entry_time,
+            'exit_time': exit_time,
             'duration_hours': (exit_time - entry_time).total_seconds() / 3600
         }
         
@@ -112,6 +133,9 @@ class TradeLogger:
         self.trade_count += 1
         if pnl > 0:
             self.win_count += 1
+        self._pnl_buf[self._pnl_idx] = pnl
+        self._pnl_idx = (self._pnl_idx + 1) % self._pnl_buf.size
+        self._pnl_n = min(self._pnl_n + 1, self._pnl_buf.size)
         
         win_rate = (self.win_count / self.trade_count * 100) if self.trade_count > 0 else 0
         
@@ -124,7 +148,7 @@ class TradeLogger:
     def log_error(self, error_type: str, message: str, details: Optional[Dict] = None):
         """Log error"""
         event = {
-            'timestamp': datetime.utcnow().isoformat(),
+            'timestamp': datetime.utcnow(),
             'event': 'ERROR',
             'error_type': error_type,
             'message': message,
@@ -135,22 +159,66 @@ class TradeLogger:
         logger.error(f"{error_type}: {message}")
     
     def get_summary(self) -> Dict:
-        """Get trading summary"""
+        """
+        Get trading summary.
+        
+        Besides the running totals, includes per-trade statistics over the
+        last PNL_HISTORY_SIZE trades: recent_sharpe (mean / std of trade PnL,
+        not annualized) and recent_max_drawdown (largest peak-to-trough drop
+        of cumulative PnL, in USDT).
+        """
         win_rate = (self.win_count / self.trade_count * 100) if self.trade_count > 0 else 0
         
+        recent = self._recent_pnls()
+        sharpe = 0.0
+        max_drawdown = 0.0
+        if recent.size > 0:
+            if recent.size > 1:
+                std = recent.std(ddof=1)
+                if std > 0:
+                    sharpe = float(recent.mean() / std)
+            equity = np.cumsum(recent)
+            # Peak includes the starting point (0 PnL) so a losing first trade counts
+            peak = np.maximum(np.maximum.accumulate(equity), 0.0)
+            max_drawdown = float((peak - equity).max())
+        
         return {
             'total_pnl': self.total_pnl,
             'daily_pnl': self.daily_pnl,
             'trade_count': self.trade_count,
             'win_count': self.win_count,
-            'win_rate': win_rate
+            'win_rate': win_rate,
+            'recent_trades': int(recent.size),
+            'recent_sharpe': sharpe,
+            'recent_max_drawdown': max_drawdown
         }
     
+    def _recent_pnls(self) -> np.ndarray:
+        """Buffered trade PnLs, oldest first"""
+        if self._pnl_n < self._pnl_buf.size:
+            return self._pnl_buf[:self._pnl_n]
+        return np.concatenate((self._pnl_buf[self._pnl_idx:], self._pnl_buf[:self._pnl_idx]))
+    
     def _write_log(self, log_dir: Path, event: Dict):
         """Write log entry to file"""
         today = datetime.utcnow().strftime('%Y%m%d')
-        log_file = log_dir / f"trades_{today}.jsonl"
+        # datetimes are serialized as ISO 8601 by the encoder
+        line = dumps(event) + b'\n'
         
-        with open(log_file, 'a') as f:
-            f.write(json.dumps(event) + '\n')
+        with self._files_lock:
+            entry = self._open_files.get(log_dir)
+            if entry is None or entry[0] != today:
+                if entry is not None:
+                    entry[1].close()
+                log_file = log_dir / f"trades_{today}.jsonl"
+                entry = (today, open(log_file, 'ab', buffering=0))
+                self._open_files[log_dir] = entry
+            entry[1].write(line)
+    
+    def close(self):
+        """Close open log files"""
+        with self._files_lock:
+            for _, f in self._open_files.values():
+                f.close()
+            self._open_files.clear()
 
@@ -0,0 +1,105 @@
+"""Numba-compiled score components used by PortfolioSelector._score_batch"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    NUMBA_AVAILABLE = False
+
+
+# Column order of the component matrix (matches the score weight vector)
+COMPONENT_SHARPE = 0
+COMPONENT_ADX = 1
+COMPONENT_CONFIDENCE = 2
+COMPONENT_VOLATILITY = 3
+
+
+if NUMBA_AVAILABLE:
+    @njit(inline='always')
+    def _clip01(x):
+        """Clip to [0, 1], passing NaN through like np.clip"""
+        if x < 0.0:
+            return 0.0
+        if x > 1.0:
+            return 1.0
+        return x
+
+    # error_model='numpy' so x / 0 gives inf/NaN as in the NumPy path
+    # instead of raising ZeroDivisionError
+    @njit(parallel=True, cache=True, error_model='numpy')
+    def _score_kernel(closes, atrs, adxs, confidences, components):
+        """One pass per symbol over its close/ATR window (see _score_components)"""
+        n_symbols, window = closes.shape
+        lookback = window - 1
+
+        for i in prange(n_symbols):
+            # 1. Risk-adjusted return over the last `lookback` returns
+            ret_sum = 0.0
+            close_sum = 0.0
+            for j in range(1, window):
+                ret_sum += closes[i, j] / closes[i, j - 1] - 1
+                close_sum += closes[i, j]
+            ret_mean = ret_sum / lookback
+            sq_sum = 0.0
+            for j in range(1, window):
+                d = closes[i, j] / closes[i, j - 1] - 1 - ret_mean
+                sq_sum += d * d
+            ret_std = np.sqrt(sq_sum / (lookback - 1))
+            if ret_std > 0:
+                components[i, COMPONENT_SHARPE] = _clip01((ret_mean / ret_std + 2) / 4)
+            else:
+                components[i, COMPONENT_SHARPE] = np.nan  # Resolved by the caller
+
+            # 2. Trend strength (ADX)
+            components[i, COMPONENT_ADX] = _clip01(adxs[i] / 50.0)
+
+            # 3. Model confidence
+            components[i, COMPONENT_CONFIDENCE] = confidences[i]
+
+            # 4. Volatility: current ATR/close relative to its lookback average
+            atr_sum = 0.0
+            atr_count = 0
+            for j in range(atrs.shape[1]):
+                if not np.isnan(atrs[i, j]):
+                    atr_sum += atrs[i, j]
+                    atr_count += 1
+            avg_volatility = (atr_sum / atr_count) / (close_sum / lookback)
+            if avg_volatility == 0:
+                components[i, COMPONENT_VOLATILITY] = 0.5
+            else:
+                ratio = (atrs[i, -1] / closes[i, -1]) / avg_volatility
+                components[i, COMPONENT_VOLATILITY] = _clip01(1.0 / (1.0 + ratio))
+
+
+def _score_components(
+    closes: np.ndarray,
+    atrs: np.ndarray,
+    adxs: np.ndarray,
+    confidences: np.ndarray
+) -> np.ndarray:
+    """
+    Compute the four score components for every symbol (requires numba).
+
+    Semantics match the NumPy path in PortfolioSelector._score_batch, except
+    that the Sharpe component is NaN for symbols whose recent returns are
+    flat: that case depends on the full return history, which the caller
+    resolves. Summation runs left to right rather than pairwise, so results
+    can differ from NumPy in the last ulp.
+
+    Args:
+        closes: float64 (N, lookback + 1) finite recent closes
+        atrs: float64 (N, lookback) recent ATR values (NaN skipped)
+        adxs: float64 latest ADX per symbol
+        confidences: float64 model confidence per symbol
+
+    Returns:
+        float64 (N, 4) matrix of [sharpe, adx, confidence, volatility] scores
+    """
+    components = np.empty((closes.shape[0], 4), dtype=np.float64)
+    _score_kernel(
+        np.ascontiguousarray(closes), np.ascontiguousarray(atrs),
+        adxs, confidences, components
+    )
+    return components
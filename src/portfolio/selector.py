@@ -3,9 +3,21 @@
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple, Optional
+from collections import deque
 from datetime import datetime, timedelta
 from loguru import logger
 
+from src.portfolio._score_numba import NUMBA_AVAILABLE
+
+if NUMBA_AVAILABLE:
+    from src.portfolio._score_numba import _score_components
+
+
+def _nanmean(values: np.ndarray) -> float:
+    """Mean ignoring NaN (NaN if every value is NaN), like pandas Series.mean()"""
+    valid = values[~np.isnan(values)]
+    return valid.mean() if len(valid) else np.nan
+
 
 class PortfolioSelector:
     """
@@ -55,24 +67,29 @@ class PortfolioSelector:
         self.selected_symbols = []
         self.symbol_scores = {}
         
+        # Incremental per-symbol scoring state (see update_bar_state)
+        self._bar_state: Dict[str, dict] = {}
+        
         logger.info(f"Initialized PortfolioSelector (enabled={self.enabled}, top_k={self.top_k})")
     
-    def calculate_sharpe_score(self, returns: pd.Series, lookback_days: int = 30) -> float:
+    def calculate_sharpe_score(self, returns: np.ndarray, lookback_days: int = 30) -> float:
         """
         Calculate risk-adjusted return score (Sharpe-like).
         
         Args:
-            returns: Series of returns
+            returns: Array of returns (NaN-free; a Series is also accepted)
             lookback_days: Lookback period in days
             
         Returns:
             Sharpe-like score (normalized)
         """
-        if len(returns) < lookback_days or returns.std() == 0:
+        returns = np.asarray(returns, dtype=np.float64)
+        if len(returns) < lookback_days or returns.std(ddof=1) == 0:
             return 0.0
         
-        recent_returns = returns.tail(lookback_days)
-        sharpe = recent_returns.mean() / recent_returns.std() if recent_returns.std() > 0 else 0.0
+        recent_returns = returns[-lookback_days:]
+        recent_std = recent_returns.std(ddof=1)
+        sharpe = recent_returns.mean() / recent_std if recent_std > 0 else 0.0
         
         # Normalize to [0, 1] range (assuming Sharpe typically [-2, 2])
         return float(np.clip((sharpe + 2) / 4, 0.0, 1.0))
@@ -132,19 +149,20 @@ class PortfolioSelector:
         if df.empty or len(df) < 30:
             return 0.0
         
-        latest = df.iloc[-1]
+        # Extract columns once; the sub-scorers work on plain arrays/floats
+        closes = df['close'].to_numpy(dtype=np.float64) if 'close' in df.columns else None
         
         # 1. Risk-adjusted return (Sharpe-like)
-        if 'close' in df.columns:
-            returns = df['close'].pct_change().dropna()
-            sharpe_score = self.calculate_sharpe_score(returns)
+        if closes is not None:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                returns = closes[1:] / closes[:-1] - 1  # pct_change
+            sharpe_score = self.calculate_sharpe_score(returns[~np.isnan(returns)])
         else:
             sharpe_score = 0.0
         
         # 2. Trend strength (ADX)
         if 'adx' in df.columns:
-            adx_value = latest.get('adx', 0)
-            adx_score = self.calculate_trend_strength(adx_value)
+            adx_score = self.calculate_trend_strength(df['adx'].iat[-1])
         else:
             adx_score = 0.0
         
@@ -155,10 +173,11 @@ class PortfolioSelector:
             confidence_score = 0.5  # Neutral if not available
         
         # 4. Volatility (lower is better)
-        if 'atr' in df.columns and 'close' in df.columns:
-            current_atr = latest.get('atr', 0)
-            avg_atr = df['atr'].tail(30).mean() if len(df) >= 30 else current_atr
-            volatility_score = self.calculate_volatility_score(current_atr / latest['close'], avg_atr / df['close'].tail(30).mean())
+        if 'atr' in df.columns and closes is not None:
+            atrs = df['atr'].to_numpy(dtype=np.float64)
+            avg_atr = _nanmean(atrs[-30:])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                volatility_score = self.calculate_volatility_score(atrs[-1] / closes[-1], avg_atr / _nanmean(closes[-30:]))
         else:
             volatility_score = 0.5  # Neutral if not available
         
@@ -172,9 +191,191 @@ class PortfolioSelector:
         
         return float(np.clip(composite_score, 0.0, 1.0))
     
+    def update_bar_state(self, symbol: str, df: pd.DataFrame, lookback: int = 30):
+        """
+        Update the incremental scoring state for a symbol from its indicator frame.
+        
+        The state holds the last lookback + 1 closes, lookback ATR values, the
+        latest ADX and whether the symbol's full return history is flat (which
+        decides the Sharpe score when recent returns have zero std). When df
+        is the previously seen frame plus one new bar (matched on timestamp),
+        the update is O(1); otherwise the state is rebuilt from df.
+        
+        Args:
+            symbol: Trading symbol
+            df: DataFrame with timestamp, close, atr and adx columns
+            lookback: Return/volatility lookback in bars
+        """
+        state = self._bar_state.get(symbol)
+        if state is not None and len(df) >= 2 and 'timestamp' in df.columns:
+            timestamps = df['timestamp']
+            if timestamps.iat[-1] == state['last_ts']:
+                return
+            if timestamps.iat[-2] == state['last_ts']:
+                close = float(df['close'].iat[-1])
+                if np.isfinite(close):
+                    ret = close / state['closes'][-1] - 1
+                    if state['flat_return'] is not None and ret != state['flat_return']:
+                        state['flat_return'] = None
+                    state['closes'].append(close)
+                    state['atrs'].append(float(df['atr'].iat[-1]))
+                    state['adx'] = df['adx'].iat[-1]
+                    state['last_ts'] = timestamps.iat[-1]
+                    return
+        
+        # Cold start or gap: rebuild from the frame
+        self._bar_state.pop(symbol, None)
+        window = lookback + 1
+        if len(df) < window or not {'timestamp', 'close', 'adx', 'atr'}.issubset(df.columns):
+            return
+        closes = df['close'].to_numpy(dtype=np.float64)
+        close_tail = closes[-window:]
+        if not np.isfinite(close_tail).all():
+            return
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = closes[1:] / closes[:-1] - 1
+        returns = returns[~np.isnan(returns)]
+        self._bar_state[symbol] = {
+            'closes': deque(close_tail.tolist(), maxlen=window),
+            'atrs': deque(df['atr'].to_numpy(dtype=np.float64)[-lookback:].tolist(), maxlen=lookback),
+            'adx': df['adx'].iat[-1],
+            'last_ts': df['timestamp'].iat[-1],
+            'flat_return': float(returns[0]) if returns.std(ddof=1) == 0 else None
+        }
+    
+    def has_bar_state(self, symbol: str, last_timestamp=None) -> bool:
+        """
+        Check if a symbol can be scored from its incremental state.
+        
+        Args:
+            symbol: Trading symbol
+            last_timestamp: Timestamp of the symbol's latest bar (optional);
+                the state must be up to date with it
+            
+        Returns:
+            True if select_symbols can take None for this symbol's DataFrame
+        """
+        state = self._bar_state.get(symbol)
+        return state is not None and (last_timestamp is None or state['last_ts'] == last_timestamp)
+    
+    def _score_batch(
+        self,
+        symbol_data: Dict[str, Optional[pd.DataFrame]],
+        symbol_confidence: Optional[Dict[str, float]] = None,
+        lookback: int = 30
+    ) -> Dict[str, float]:
+        """
+        Score all symbols at once (same result as score_symbol per symbol).
+        
+        Symbols with close/adx/atr columns and at least lookback + 1 finite
+        recent closes, and symbols passed as None (scored from the state kept
+        by update_bar_state), are stacked into (N, lookback + 1) arrays and
+        scored with one vectorized op per component (or one compiled pass per
+        symbol when numba is installed) and a single dot product with the
+        weight vector. The rest go through score_symbol.
+        
+        Args:
+            symbol_data: Dictionary of {symbol: DataFrame or None} with market data
+            symbol_confidence: Optional dictionary of {symbol: confidence} from model
+            lookback: Return/volatility lookback in bars
+        
+        Returns:
+            Dictionary of {symbol: composite score [0, 1]}
+        """
+        window = lookback + 1
+        scores = {}
+        batch_symbols = []
+        closes, atrs, adxs, confidences, sources = [], [], [], [], []
+        
+        for symbol, df in symbol_data.items():
+            confidence = symbol_confidence.get(symbol) if symbol_confidence else None
+            if df is None:
+                state = self._bar_state.get(symbol)
+                if state is None:
+                    scores[symbol] = 0.0  # No data
+                    continue
+                close_tail = np.fromiter(state['closes'], dtype=np.float64, count=window)
+                atr_tail = np.fromiter(state['atrs'], dtype=np.float64, count=lookback)
+                adx = state['adx']
+                source = state
+            elif len(df) >= window and {'close', 'adx', 'atr'}.issubset(df.columns):
+                close_tail = df['close'].to_numpy(dtype=np.float64)[-window:]
+                if not np.isfinite(close_tail).all():
+                    scores[symbol] = self.score_symbol(symbol, df, confidence)
+                    continue
+                atr_tail = df['atr'].to_numpy(dtype=np.float64)[-lookback:]
+                adx = df['adx'].iat[-1]
+                source = df
+            else:
+                scores[symbol] = self.score_symbol(symbol, df, confidence)
+                continue
+            
+            batch_symbols.append(symbol)
+            closes.append(close_tail)
+            atrs.append(atr_tail)
+            adxs.append(adx)
+            confidences.append(0.5 if confidence is None else confidence)  # Neutral if not available
+            sources.append(source)
+        
+        if not batch_symbols:
+            return {symbol: scores[symbol] for symbol in symbol_data}
+        
+        closes = np.vstack(closes)
+        atrs = np.vstack(atrs)
+        adxs = np.asarray(adxs, dtype=np.float64)
+        confidences = np.asarray(confidences, dtype=np.float64)
+        
+        # Columns: sharpe, adx, confidence, volatility scores. The Sharpe
+        # score is left NaN where the recent returns are flat.
+        if NUMBA_AVAILABLE:
+            components = _score_components(closes, atrs, adxs, confidences)
+        else:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # 1. Risk-adjusted return over the last `lookback` returns
+                returns = closes[:, 1:] / closes[:, :-1] - 1
+                returns_std = returns.std(axis=1, ddof=1)
+                sharpe = np.where(returns_std > 0, returns.mean(axis=1) / returns_std, np.nan)
+                sharpe_score = np.clip((sharpe + 2) / 4, 0.0, 1.0)
+                
+                # 2. Trend strength (ADX)
+                adx_score = np.clip(adxs / 50.0, 0.0, 1.0)
+                
+                # 3. Model confidence
+                confidence_score = confidences
+                
+                # 4. Volatility: current ATR/close relative to its lookback average (NaN-skipping mean, as pandas)
+                atr_valid = ~np.isnan(atrs)
+                avg_atr = np.where(atr_valid, atrs, 0.0).sum(axis=1) / atr_valid.sum(axis=1)
+                avg_volatility = avg_atr / closes[:, 1:].mean(axis=1)
+                ratio = (atrs[:, -1] / closes[:, -1]) / avg_volatility
+                volatility_score = np.where(avg_volatility == 0, 0.5, np.clip(1.0 / (1.0 + ratio), 0.0, 1.0))
+            
+            components = np.column_stack([sharpe_score, adx_score, confidence_score, volatility_score])
+        
+        # Flat recent returns: calculate_sharpe_score gives 0 when the whole
+        # return history is flat, else the neutral 0.5 (Sharpe of 0)
+        for i in np.flatnonzero(np.isnan(components[:, 0])):
+            source = sources[i]
+            if isinstance(source, dict):
+                history_flat = source['flat_return'] is not None
+            else:
+                history = source['close'].to_numpy(dtype=np.float64)
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    history_returns = history[1:] / history[:-1] - 1
+                history_flat = history_returns[~np.isnan(history_returns)].std(ddof=1) == 0
+            components[i, 0] = 0.0 if history_flat else 0.5
+        
+        weights = np.array([self.weight_sharpe, self.weight_adx, self.weight_confidence, self.weight_volatility])
+        composite = np.clip(components @ weights, 0.0, 1.0)
+        
+        scores.update(zip(batch_symbols, composite.tolist()))
+        # Keep input order (ties in select_symbols keep their original order)
+        return {symbol: scores[symbol] for symbol in symbol_data}
+    
     def select_symbols(
         self,
-        symbol_data: Dict[str, pd.DataFrame],
+        symbol_data: Dict[str, Optional[pd.DataFrame]],
         symbol_confidence: Optional[Dict[str, float]] = None
     ) -> List[str]:
         """
@@ -182,6 +383,7 @@ class PortfolioSelector:
         
         Args:
             symbol_data: Dictionary of {symbol: DataFrame} with market data
+                (None = score from the state kept by update_bar_state)
             symbol_confidence: Optional dictionary of {symbol: confidence} from model
             
         Returns:
@@ -195,17 +397,21 @@ class PortfolioSelector:
             return []
         
         # Calculate scores for all symbols
-        scores = {}
-        for symbol, df in symbol_data.items():
-            confidence = symbol_confidence.get(symbol) if symbol_confidence else None
-            score = self.score_symbol(symbol, df, confidence)
-            scores[symbol] = score
-        
-        # Sort by score (descending)
-        sorted_symbols = sorted(scores.items(), key=lambda x: x[1], reverse=True)
-        
-        # Select top K
-        selected = [symbol for symbol, score in sorted_symbols[:self.top_k]]
+        scores = self._score_batch(symbol_data, symbol_confidence)
+        
+        # Select top K by partial sort (O(N)); NaN scores rank last
+        symbol_names = list(scores)
+        values = np.fromiter(scores.values(), dtype=np.float64, count=len(symbol_names))
+        values[np.isnan(values)] = -np.inf
+        k = min(self.top_k, len(values))
+        selected = []
+        if k > 0:
+            kth = values[np.argpartition(-values, k - 1)[k - 1]]
+            # Ties at the cut keep input order, as a stable descending sort would
+            idx = np.flatnonzero(values > kth)
+            idx = np.concatenate([idx, np.flatnonzero(values == kth)[:k - len(idx)]])
+            idx = idx[np.argsort(-values[idx], kind='stable')]
+            selected = [symbol_names[i] for i in idx]
         
         # Store scores and selection
         self.symbol_scores = scores
@@ -0,0 +1,30 @@
+"""Numba-compiled drawdown scan used by PerformanceGuard.max_drawdown_in_window"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    NUMBA_AVAILABLE = False
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True)
+    def _ring_max_drawdown(pnl, start, count, initial_equity):
+        """
+        Max drawdown of initial_equity + cumulative PnL, walking `count`
+        ring-buffer slots from `start` (oldest first) without gathering them.
+        Same result as the NumPy path in PerformanceGuard.max_drawdown_in_window.
+        """
+        size = pnl.shape[0]
+        cum_pnl = 0.0
+        peak = initial_equity
+        max_dd = 0.0
+        for k in range(count):
+            cum_pnl += pnl[(start + k) % size]
+            equity = initial_equity + cum_pnl
+            if equity > peak:
+                peak = equity
+            dd = (peak - equity) / peak
+            if dd > max_dd:
+                max_dd = dd
+        return max_dd
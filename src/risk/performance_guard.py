@@ -1,10 +1,38 @@
 """Performance guard for automatic risk throttling"""
 
-from typing import Dict, Tuple, Optional
-from datetime import datetime, timedelta
+import time
+import numpy as np
+from enum import IntEnum
+from types import MappingProxyType
 from collections import deque
+from typing import Dict, Sequence, Tuple, Optional
+from datetime import datetime, timedelta
 from loguru import logger
 
+from src.risk._guard_numba import NUMBA_AVAILABLE
+
+if NUMBA_AVAILABLE:
+    from src.risk._guard_numba import _ring_max_drawdown
+
+
+class Status(IntEnum):
+    """Guard tier (reported by name, e.g. "PAUSED", outside this module)"""
+    NORMAL = 0
+    REDUCED = 1
+    PAUSED = 2
+
+
+# (log level, label) logged when the guard enters each status, indexed by Status
+STATUS_TRANSITION_LOG = (
+    ("INFO", "RECOVERED to NORMAL"),
+    ("WARNING", "REDUCED RISK"),
+    ("WARNING", "PAUSED")
+)
+
+# Position size multiplier / confidence threshold adjustment, indexed by Status
+SIZE_MULTIPLIER = (1.0, 0.5, 0.0)
+CONFIDENCE_ADJUSTMENT = (0.0, 0.1, 0.0)
+
 
 class PerformanceGuard:
     """
@@ -15,6 +43,20 @@ class PerformanceGuard:
     - REDUCED: 50% position size, +0.1 confidence threshold
     - PAUSED: Stop trading until recovery
     """
+    __slots__ = (
+        'enabled', 'rolling_window_trades',
+        'win_rate_threshold_reduced', 'drawdown_threshold_reduced',
+        'win_rate_threshold_paused', 'drawdown_threshold_paused',
+        'recovery_win_rate', 'recovery_drawdown', 'peak_window_seconds',
+        '_pnl', '_win', '_trade_idx', '_trade_count',
+        '_pnl_sum', '_window_pnl', '_window_wins', '_losing_streak',
+        'peak_equity', 'initial_equity', '_equity_initialized', '_peak_deque',
+        'current_status', 'status_since_ns', '_dirty', '_cached_metrics',
+        '_disabled_status'
+    )
+    
+    # Read-only results shared by every call while the guard is disabled
+    _DISABLED_RESULT = ("NORMAL", MappingProxyType({}))
     
     def __init__(self, config: dict):
         """
@@ -40,12 +82,40 @@ class PerformanceGuard:
         self.recovery_win_rate = guard_config.get('recovery_win_rate', 0.45)
         self.recovery_drawdown = guard_config.get('recovery_drawdown', 0.05)
         
+        # Peak equity look-back for drawdown (0/None = all-time peak)
+        self.peak_window_seconds = guard_config.get('peak_window_seconds', 0)
+        
         # State tracking
-        self.recent_trades = deque(maxlen=self.rolling_window_trades * 2)  # Keep more for recovery
-        self.peak_equity = None
-        self.initial_equity = None
-        self.current_status = "NORMAL"
-        self.status_since = datetime.utcnow()
+        # Ring buffer of the last 2x window trades (keep more for recovery) as
+        # parallel PnL / win arrays; _trade_idx is the next slot to write
+        capacity = max(self.rolling_window_trades * 2, 1)
+        self._pnl = np.zeros(capacity, dtype=np.float64)
+        self._win = np.zeros(capacity, dtype=np.bool_)
+        self._trade_idx = 0
+        self._trade_count = 0
+        # Running totals updated as trades enter/leave the buffer and the
+        # rolling window, so get_recent_metrics does no pass over the trades
+        self._pnl_sum = 0.0       # all buffered trades (drawdown)
+        self._window_pnl = 0.0    # last rolling_window_trades trades
+        self._window_wins = 0
+        self._losing_streak = 0   # consecutive losses since the last win
+        # Float sentinels until the first update_equity (peak -inf never
+        # passes a `> 0` check, so drawdown stays 0 without None checks)
+        self.peak_equity = float('-inf')
+        self.initial_equity = 0.0
+        self._equity_initialized = False
+        # Rolling peak: (time.monotonic(), equity) with equity strictly
+        # decreasing front to back, so the front is the window maximum
+        self._peak_deque = deque()
+        self.current_status = Status.NORMAL
+        self.status_since_ns = time.time_ns()  # Epoch nanoseconds (UTC)
+        
+        # check_status result is reused until a trade or a peak/initial
+        # equity change can move the metrics (status transitions are
+        # idempotent for unchanged metrics)
+        self._dirty = True
+        self._cached_metrics: Optional[Dict[str, float]] = None
+        self._disabled_status = None  # Built on first get_status while disabled
         
         logger.info(f"Initialized PerformanceGuard (enabled={self.enabled})")
     
@@ -53,15 +123,36 @@ class PerformanceGuard:
         """
         Update current equity for drawdown tracking.
         
+        With peak_window_seconds set, peak_equity is the highest equity seen
+        in that window (sliding-window maximum, O(1) amortized per update),
+        so the drawdown reference recovers after a retracement ages out.
+        
         Args:
             equity: Current account equity
         """
-        if self.initial_equity is None:
+        if not self._equity_initialized:
+            self._equity_initialized = True
             self.initial_equity = equity
             self.peak_equity = equity
-        
-        if equity > self.peak_equity:
-            self.peak_equity = equity
+            self._dirty = True
+        
+        if not self.peak_window_seconds:
+            if equity > self.peak_equity:
+                self.peak_equity = equity
+                self._dirty = True
+            return
+        
+        now = time.monotonic()
+        peaks = self._peak_deque
+        while peaks and peaks[-1][1] <= equity:
+            peaks.pop()
+        peaks.append((now, equity))
+        cutoff = now - self.peak_window_seconds
+        while peaks[0][0] < cutoff:
+            peaks.popleft()
+        if peaks[0][1] != self.peak_equity:
+            self.peak_equity = peaks[0][1]
+            self._dirty = True
     
     def record_trade(self, pnl: float, is_win: bool):
         """
@@ -71,69 +162,137 @@ class PerformanceGuard:
             pnl: Profit/loss of the trade
             is_win: True if profitable, False otherwise
         """
-        self.recent_trades.append({
-            'pnl': pnl,
-            'is_win': is_win,
-            'timestamp': datetime.utcnow()
-        })
+        window = self.rolling_window_trades
+        if window > 0 and self._trade_count >= window:
+            # The trade `window` back drops out of the rolling window
+            out = (self._trade_idx - window) % self._pnl.size
+            self._window_pnl -= self._pnl[out]
+            self._window_wins -= int(self._win[out])
+        if self._trade_count == self._pnl.size:
+            # Buffer full: the oldest trade (about to be overwritten) is evicted
+            self._pnl_sum -= self._pnl[self._trade_idx]
+        
+        self._pnl[self._trade_idx] = pnl
+        self._win[self._trade_idx] = is_win
+        self._pnl_sum += pnl
+        if window > 0:
+            self._window_pnl += pnl
+            self._window_wins += int(bool(is_win))
+        self._losing_streak = 0 if is_win else self._losing_streak + 1
+        self._trade_idx = (self._trade_idx + 1) % self._pnl.size
+        self._trade_count = min(self._trade_count + 1, self._pnl.size)
+        self._dirty = True
         
         # Update equity (simplified - assumes pnl is already reflected)
         # In practice, this should be called with actual equity
     
+    def record_trades(self, pnls: Sequence[float], wins: Sequence[bool]):
+        """
+        Record several completed trades at once (oldest first).
+        
+        Same end state as calling record_trade for each trade in order, with
+        one ring-buffer write and one recount of the running totals.
+        
+        Args:
+            pnls: Profit/loss of each trade
+            wins: True for each profitable trade
+        """
+        pnls = np.asarray(pnls, dtype=np.float64)
+        wins = np.asarray(wins, dtype=np.bool_)
+        n_new = len(pnls)
+        if n_new == 0:
+            return
+        
+        # Only the last `capacity` trades survive in the buffer
+        capacity = self._pnl.size
+        skipped = max(n_new - capacity, 0)
+        slots = (self._trade_idx + np.arange(skipped, n_new)) % capacity
+        self._pnl[slots] = pnls[skipped:]
+        self._win[slots] = wins[skipped:]
+        self._trade_idx = (self._trade_idx + n_new) % capacity
+        self._trade_count = min(self._trade_count + n_new, capacity)
+        
+        # Recount running totals from the buffer
+        self._pnl_sum = float(self._pnl[:self._trade_count].sum())
+        window = min(self.rolling_window_trades, self._trade_count)
+        if window > 0:
+            window_idx = np.arange(self._trade_idx - window, self._trade_idx)
+            self._window_pnl = float(np.take(self._pnl, window_idx, mode='wrap').sum())
+            self._window_wins = int(np.take(self._win, window_idx, mode='wrap').sum())
+        if wins.any():
+            self._losing_streak = n_new - 1 - int(np.flatnonzero(wins)[-1])
+        else:
+            self._losing_streak += n_new
+        self._dirty = True
+    
     def get_recent_metrics(self) -> Dict[str, float]:
         """
         Calculate recent performance metrics.
         
         Returns:
-            Dictionary with win_rate, total_pnl, drawdown
+            Dictionary with win_rate, total_pnl, drawdown (from peak equity),
+            max_drawdown (see max_drawdown_in_window; reported only, since it
+            only changes when trades are recorded and a paused guard records none)
         """
-        if len(self.recent_trades) == 0:
-            return {
-                'win_rate': 0.0,
-                'total_pnl': 0.0,
-                'losing_streak': 0,
-                'drawdown': 0.0,
-                'num_trades': 0
-            }
-        
         # Last N trades
-        recent = list(self.recent_trades)[-self.rolling_window_trades:]
+        n = min(self._trade_count, self.rolling_window_trades)
         
-        if len(recent) == 0:
+        if n == 0:
             return {
                 'win_rate': 0.0,
                 'total_pnl': 0.0,
                 'losing_streak': 0,
                 'drawdown': 0.0,
+                'max_drawdown': 0.0,
                 'num_trades': 0
             }
         
-        wins = sum(1 for t in recent if t['is_win'])
-        win_rate = wins / len(recent) if len(recent) > 0 else 0.0
-        total_pnl = sum(t['pnl'] for t in recent)
+        win_rate = self._window_wins / n
+        total_pnl = float(self._window_pnl)
         
-        # Calculate losing streak
-        losing_streak = 0
-        for t in reversed(recent):
-            if t['is_win']:
-                break
-            losing_streak += 1
+        # Losing streak within the window
+        losing_streak = min(self._losing_streak, n)
         
         # Drawdown (if peak equity is set)
         drawdown = 0.0
-        if self.peak_equity and self.initial_equity:
-            current_equity = self.initial_equity + sum(t['pnl'] for t in self.recent_trades)
-            if self.peak_equity > 0:
-                drawdown = (self.peak_equity - current_equity) / self.peak_equity
+        if self.peak_equity > 0 and self.initial_equity:
+            current_equity = self.initial_equity + float(self._pnl_sum)
+            drawdown = (self.peak_equity - current_equity) / self.peak_equity
         
         return {
             'win_rate': win_rate,
             'total_pnl': total_pnl,
             'losing_streak': losing_streak,
             'drawdown': drawdown,
-            'num_trades': len(recent)
+            'max_drawdown': self.max_drawdown_in_window(),
+            'num_trades': n
         }
     
+    def max_drawdown_in_window(self) -> float:
+        """
+        Largest peak-to-trough drop of the equity curve over the buffered trades.
+        
+        The curve starts at initial_equity and adds each buffered trade's PnL
+        in order (like the drawdown metric, trades evicted from the buffer
+        are not included).
+        
+        Returns:
+            Max drawdown as a fraction of the running peak (0.0 without equity or trades)
+        """
+        if self._trade_count == 0 or self.initial_equity <= 0:
+            return 0.0
+        
+        start = self._trade_idx - self._trade_count
+        if NUMBA_AVAILABLE:
+            return _ring_max_drawdown(self._pnl, start % self._pnl.size, self._trade_count, float(self.initial_equity))
+        
+        # Buffered PnLs, oldest first
+        pnls = np.take(self._pnl, np.arange(start, self._trade_idx), mode='wrap')
+        equity = self.initial_equity + np.cumsum(pnls)
+        # Running peak includes the starting equity, so early losses count
+        peak = np.maximum(np.maximum.accumulate(equity), self.initial_equity)
+        return float(((peak - equity) / peak).max())
+    
     def check_status(self, current_equity: Optional[float] = None) -> Tuple[str, Dict[str, float]]:
         """
         Check current status and update if needed.
@@ -145,57 +304,66 @@ class PerformanceGuard:
             Tuple of (status, metrics_dict)
         """
         if not self.enabled:
-            return "NORMAL", {}
+            return self._DISABLED_RESULT
         
         if current_equity:
             self.update_equity(current_equity)
         
+        if not self._dirty and self._cached_metrics is not None:
+            return self.current_status.name, self._cached_metrics
+        
         metrics = self.get_recent_metrics()
         
-        # Check if we should pause
-        if (metrics['win_rate'] < self.win_rate_threshold_paused and metrics['num_trades'] >= 5) or \
-           metrics['losing_streak'] >= 10 or \
-           (metrics['drawdown'] > self.drawdown_threshold_paused and self.peak_equity):
-            
-            if self.current_status != "PAUSED":
-                logger.warning(
-                    f"Performance guard: PAUSED | "
-                    f"Win rate: {metrics['win_rate']:.2%}, "
-                    f"Drawdown: {metrics['drawdown']:.2%}, "
-                    f"Losing streak: {metrics['losing_streak']}"
-                )
-                self.current_status = "PAUSED"
-                self.status_since = datetime.utcnow()
-        
-        # Check if we should reduce risk
-        elif (metrics['win_rate'] < self.win_rate_threshold_reduced and metrics['num_trades'] >= 5) or \
-             metrics['losing_streak'] >= 5 or \
-             (metrics['drawdown'] > self.drawdown_threshold_reduced and self.peak_equity):
-            
-            if self.current_status == "NORMAL":
-                logger.warning(
-                    f"Performance guard: REDUCED RISK | "
-                    f"Win rate: {metrics['win_rate']:.2%}, "
-                    f"Drawdown: {metrics['drawdown']:.2%}"
-                )
-                self.current_status = "REDUCED"
-                self.status_since = datetime.utcnow()
-        
-        # Check recovery conditions
-        elif self.current_status in ["PAUSED", "REDUCED"]:
-            if metrics['win_rate'] >= self.recovery_win_rate and \
-               metrics['num_trades'] >= 5 and \
-               metrics['drawdown'] < self.recovery_drawdown:
-                
-                logger.info(
-                    f"Performance guard: RECOVERED to NORMAL | "
-                    f"Win rate: {metrics['win_rate']:.2%}, "
-                    f"Drawdown: {metrics['drawdown']:.2%}"
-                )
-                self.current_status = "NORMAL"
-                self.status_since = datetime.utcnow()
-        
-        return self.current_status, metrics
+        win_rate = metrics['win_rate']
+        drawdown = metrics['drawdown']
+        losing_streak = metrics['losing_streak']
+        enough_trades = metrics['num_trades'] >= 5
+        has_peak = self.peak_equity > 0
+        
+        paused = (
+            (win_rate < self.win_rate_threshold_paused and enough_trades)
+            or losing_streak >= 10
+            or (drawdown > self.drawdown_threshold_paused and has_peak)
+        )
+        reduced = (
+            (win_rate < self.win_rate_threshold_reduced and enough_trades)
+            or losing_streak >= 5
+            or (drawdown > self.drawdown_threshold_reduced and has_peak)
+        )
+        recovered = (
+            win_rate >= self.recovery_win_rate
+            and enough_trades
+            and drawdown < self.recovery_drawdown
+        )
+        
+        # Pause from any tier; reduce only from NORMAL (a PAUSED guard stays
+        # paused until it recovers); recover only when neither trigger holds
+        current = self.current_status
+        if paused:
+            new_status = Status.PAUSED
+        elif reduced:
+            new_status = Status.REDUCED if current is Status.NORMAL else current
+        else:
+            new_status = Status.NORMAL if recovered and current is not Status.NORMAL else current
+        
+        if new_status != current:
+            level, label = STATUS_TRANSITION_LOG[new_status]
+            message = f"Performance guard: {label} | Win rate: {win_rate:.2%}, Drawdown: {drawdown:.2%}"
+            if new_status is Status.PAUSED:
+                message += f", Losing streak: {losing_streak}"
+            logger.log(level, message)
+            self.current_status = new_status
+            self.status_since_ns = time.time_ns()
+        
+        self._cached_metrics = metrics
+        self._dirty = False
+        
+        return self.current_status.name, metrics
+    
+    @property
+    def status_since(self) -> datetime:
+        """Time the current status was entered (naive UTC datetime)"""
+        return datetime(1970, 1, 1) + timedelta(microseconds=self.status_since_ns // 1000)
     
     def get_size_multiplier(self) -> float:
         """
@@ -207,12 +375,7 @@ class PerformanceGuard:
         if not self.enabled:
             return 1.0
         
-        if self.current_status == "PAUSED":
-            return 0.0
-        elif self.current_status == "REDUCED":
-            return 0.5
-        else:
-            return 1.0
+        return SIZE_MULTIPLIER[self.current_status]
     
     def get_confidence_adjustment(self) -> float:
         """
@@ -224,10 +387,7 @@ class PerformanceGuard:
         if not self.enabled:
             return 0.0
         
-        if self.current_status == "REDUCED":
-            return 0.1
-        else:
-            return 0.0
+        return CONFIDENCE_ADJUSTMENT[self.current_status]
     
     def should_allow_trade(self) -> Tuple[bool, str]:
         """
@@ -239,7 +399,7 @@ class PerformanceGuard:
         if not self.enabled:
             return True, "OK"
         
-        if self.current_status == "PAUSED":
+        if self.current_status is Status.PAUSED:
             return False, "Performance guard: Trading paused due to poor performance"
         
         return True, "OK"
@@ -249,12 +409,24 @@ class PerformanceGuard:
         Get current status information.
         
         Returns:
-            Dictionary with status, metrics, and multipliers
+            Dictionary with status, metrics, and multipliers (a read-only
+            mapping with empty metrics while the guard is disabled)
         """
+        if not self.enabled:
+            if self._disabled_status is None:
+                self._disabled_status = MappingProxyType({
+                    'status': Status.NORMAL.name,
+                    'status_since': self.status_since.isoformat(),
+                    'size_multiplier': 1.0,
+                    'confidence_adjustment': 0.0,
+                    'metrics': self._DISABLED_RESULT[1]
+                })
+            return self._disabled_status
+        
         metrics = self.get_recent_metrics()
         
         return {
-            'status': self.current_status,
+            'status': self.current_status.name,
             'status_since': self.status_since.isoformat(),
             'size_multiplier': self.get_size_multiplier(),
             'confidence_adjustment': self.get_confidence_adjustment(),
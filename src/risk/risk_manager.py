@@ -1,12 +1,29 @@
 """Risk management and position sizing"""
 
-from typing import Dict, Optional, List, Tuple
+import time
+from typing import AbstractSet, Dict, Optional, List, Tuple
 from datetime import datetime, timedelta
 from loguru import logger
 
 
+NS_PER_DAY = 86_400_000_000_000
+_EPOCH = datetime(1970, 1, 1)
+
+# Logger whose callable arguments are only evaluated (and the message only
+# formatted) when a sink accepts the record; created once since opt() is not free
+_lazy_logger = logger.opt(lazy=True)
+
+
 class RiskManager:
     """Manage risk limits and position sizing"""
+    __slots__ = (
+        'config', 'max_leverage', 'max_position_size', 'max_daily_loss', '_neg_max_daily_loss',
+        'max_drawdown', 'max_open_positions', 'base_position_size',
+        'risk_per_trade_pct', 'stop_loss_pct',
+        '_min_risk_pct', '_risk_pct_span', '_vol_targeting', '_target_vol', '_max_vol_mult',
+        'daily_pnl', '_next_reset_ns', 'daily_reset_time',
+        'peak_equity', 'initial_equity', '_equity_initialized'
+    )
     
     def __init__(self, config: dict):
         """
@@ -19,17 +36,36 @@ class RiskManager:
         self.max_leverage = self.config.get('max_leverage', 3.0)
         self.max_position_size = self.config.get('max_position_size', 0.10)
         self.max_daily_loss = self.config.get('max_daily_loss', 0.05)
+        self._neg_max_daily_loss = -abs(self.max_daily_loss)  # Daily PnL floor as a fraction of equity
         self.max_drawdown = self.config.get('max_drawdown', 0.15)
         self.max_open_positions = self.config.get('max_open_positions', 3)
         self.base_position_size = self.config.get('base_position_size', 0.02)
         self.risk_per_trade_pct = self.config.get('risk_per_trade_pct', 0.015)  # 1.5% base risk per trade
         self.stop_loss_pct = self.config.get('stop_loss_pct', 0.015)  # 1.5% stop loss
         
+        # Sizing parameters used by calculate_position_size (fixed for the
+        # bot's lifetime, so resolved once here)
+        # Base risk: 1.0% of equity by default when sizing (configurable via risk_per_trade_pct)
+        base_risk_pct = self.config.get('risk_per_trade_pct', 0.01)
+        self._min_risk_pct = base_risk_pct * 0.6  # 0.6% minimum (with 1.0% base)
+        self._risk_pct_span = base_risk_pct * 1.33 - self._min_risk_pct  # Up to 1.33% maximum
+        volatility_config = self.config.get('volatility_targeting', {})
+        self._vol_targeting = volatility_config.get('enabled', False)
+        self._target_vol = volatility_config.get('target_volatility', 0.01)
+        self._max_vol_mult = volatility_config.get('max_multiplier', 2.0)
+        
         # Track daily PnL
         self.daily_pnl = 0.0
-        self.daily_reset_time = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
-        self.peak_equity = None
-        self.initial_equity = None
+        # Daily PnL resets at the next UTC midnight (POSIX days are exactly
+        # NS_PER_DAY long, so the boundary is a multiple of it)
+        day_start_ns = time.time_ns() // NS_PER_DAY * NS_PER_DAY
+        self._next_reset_ns = day_start_ns + NS_PER_DAY
+        self.daily_reset_time = _EPOCH + timedelta(microseconds=day_start_ns // 1000)
+        # Float sentinels until the first update_account_state (peak -inf
+        # never passes a `> 0` check, so the drawdown checks are skipped)
+        self.peak_equity = float('-inf')
+        self.initial_equity = 0.0
+        self._equity_initialized = False
         
         logger.info("Initialized RiskManager")
     
@@ -40,18 +76,20 @@ class RiskManager:
         Args:
             equity: Current account equity
         """
-        if self.initial_equity is None:
+        if not self._equity_initialized:
+            self._equity_initialized = True
             self.initial_equity = equity
-            self.peak_equity = equity
         
         if equity > self.peak_equity:
             self.peak_equity = equity
         
         # Reset daily PnL at midnight UTC
-        now = datetime.utcnow()
-        if now.date() > self.daily_reset_time.date():
+        now_ns = time.time_ns()
+        if now_ns >= self._next_reset_ns:
             self.daily_pnl = 0.0
-            self.daily_reset_time = now.replace(hour=0, minute=0, second=0, microsecond=0)
+            day_start_ns = now_ns // NS_PER_DAY * NS_PER_DAY
+            self._next_reset_ns = day_start_ns + NS_PER_DAY
+            self.daily_reset_time = _EPOCH + timedelta(microseconds=day_start_ns // 1000)
     
     def update_daily_pnl(self, pnl: float):
         """
@@ -62,6 +100,21 @@ class RiskManager:
         """
         self.daily_pnl += pnl
     
+    def _evaluate_risk_state(self, equity: float) -> Tuple[float, bool]:
+        """
+        Account-level checks shared by check_risk_limits and should_trigger_kill_switch.
+        
+        Args:
+            equity: Current account equity
+            
+        Returns:
+            Tuple of (drawdown from peak equity (0.0 before the first
+            equity update), whether the daily loss limit is exceeded)
+        """
+        drawdown = (self.peak_equity - equity) / self.peak_equity if self.peak_equity > 0 else 0.0
+        daily_loss_exceeded = self.daily_pnl < equity * self._neg_max_daily_loss
+        return drawdown, daily_loss_exceeded
+    
     def calculate_position_size(
         self,
         equity: float,
@@ -88,18 +141,11 @@ class RiskManager:
         Returns:
             Position size in base currency (e.g., token quantity)
         """
-        # Get stop loss percentage
-        stop_loss_pct = self.config.get('stop_loss_pct', 0.015)
-        
-        # Target risk per trade (scaled by confidence)
-        # Base risk: 1.0% of equity (configurable via risk_per_trade_pct)
-        base_risk_pct = self.config.get('risk_per_trade_pct', 0.01)  # 1.0% default
+        stop_loss_pct = self.stop_loss_pct
         
-        # Scale risk by confidence (higher confidence = higher risk)
+        # Target risk per trade, scaled by confidence (higher confidence = higher risk)
         # With base_risk_pct = 0.01: Confidence 0.3 -> 0.6% risk, Confidence 0.5 -> 1.0% risk, Confidence 1.0 -> 1.33% risk
-        min_risk_pct = base_risk_pct * 0.6  # 0.6% minimum (with 1.0% base)
-        max_risk_pct = base_risk_pct * 1.33  # 1.33% maximum (with 1.0% base)
-        target_risk_pct = min_risk_pct + (max_risk_pct - min_risk_pct) * signal_confidence
+        target_risk_pct = self._min_risk_pct + self._risk_pct_span * signal_confidence
         
         # Calculate position value based on risk
         # Risk = Position Value * Stop Loss
@@ -108,13 +154,15 @@ class RiskManager:
         position_value = target_risk_amount / stop_loss_pct
         
         # Volatility targeting (if enabled and volatility provided)
-        volatility_config = self.config.get('volatility_targeting', {})
-        if volatility_config.get('enabled', False) and current_volatility is not None:
-            target_vol = volatility_config.get('target_volatility', 0.01)
-            max_mult = volatility_config.get('max_multiplier', 2.0)
+        if self._vol_targeting and current_volatility is not None:
+            target_vol = self._target_vol
+            max_mult = self._max_vol_mult
             vol_multiplier = min(target_vol / current_volatility if current_volatility > 0 else 1.0, max_mult)
             position_value *= vol_multiplier
-            logger.debug(f"Volatility multiplier: {vol_multiplier:.2f} (vol: {current_volatility:.4f}, target: {target_vol:.4f})")
+            _lazy_logger.debug(
+                "Volatility multiplier: {:.2f} (vol: {:.4f}, target: {:.4f})",
+                lambda: vol_multiplier, lambda: current_volatility, lambda: target_vol
+            )
         
         # Cap at max position size (as percentage of equity)
         max_position_value = equity * self.max_position_size
@@ -123,13 +171,12 @@ class RiskManager:
         # Convert to quantity (quantity = value / price)
         quantity = position_value / entry_price if entry_price > 0 else 0
         
-        # Calculate actual risk for logging
-        actual_risk_pct = (position_value * stop_loss_pct) / equity if equity > 0 else 0
-        
-        logger.debug(
-            f"Position size: {quantity:.6f} (confidence: {signal_confidence:.2f}, "
-            f"target_risk: {target_risk_pct:.2%}, actual_risk: {actual_risk_pct:.2%}, "
-            f"position_value: ${position_value:.2f})"
+        # Actual risk is only computed for logging, so it is evaluated lazily too
+        _lazy_logger.debug(
+            "Position size: {:.6f} (confidence: {:.2f}, target_risk: {:.2%}, actual_risk: {:.2%}, position_value: ${:.2f})",
+            lambda: quantity, lambda: signal_confidence, lambda: target_risk_pct,
+            lambda: (position_value * stop_loss_pct) / equity if equity > 0 else 0,
+            lambda: position_value
         )
         
         return quantity
@@ -140,7 +187,8 @@ class RiskManager:
         open_positions: List[Dict],
         symbol: str,
         proposed_size: float,
-        entry_price: Optional[float] = None
+        entry_price: Optional[float] = None,
+        open_symbols: Optional[AbstractSet[str]] = None
     ) -> Tuple[bool, str]:
         """
         Check if proposed trade violates risk limits.
@@ -151,19 +199,22 @@ class RiskManager:
             symbol: Trading symbol
             proposed_size: Proposed position size in tokens (quantity)
             entry_price: Entry price per token (required for position value calculation)
+            open_symbols: Symbols of open_positions as a set (optional; callers
+                checking several trades against the same positions build it
+                once and pass it to each call)
             
         Returns:
             Tuple of (is_allowed, reason)
         """
+        current_drawdown, daily_loss_exceeded = self._evaluate_risk_state(equity)
+        
         # Check daily loss limit
-        if self.daily_pnl < -abs(equity * self.max_daily_loss):
+        if daily_loss_exceeded:
             return False, f"Daily loss limit exceeded: {self.daily_pnl:.2f}"
         
         # Check drawdown
-        if self.peak_equity:
-            current_drawdown = (self.peak_equity - equity) / self.peak_equity
-            if current_drawdown > self.max_drawdown:
-                return False, f"Max drawdown exceeded: {current_drawdown:.2%}"
+        if current_drawdown > self.max_drawdown:
+            return False, f"Max drawdown exceeded: {current_drawdown:.2%}"
         
         # Check max open positions
         if len(open_positions) >= self.max_open_positions:
@@ -181,9 +232,10 @@ class RiskManager:
             return False, f"Position size exceeds limit: ${position_value:.2f} > ${max_position_value:.2f} (max {self.max_position_size:.1%} of equity)"
         
         # Check if already have position in this symbol
-        for pos in open_positions:
-            if pos.get('symbol') == symbol:
-                return False, f"Already have position in {symbol}"
+        if open_symbols is None:
+            open_symbols = {pos.get('symbol') for pos in open_positions}
+        if symbol in open_symbols:
+            return False, f"Already have position in {symbol}"
         
         return True, "OK"
     
@@ -202,14 +254,14 @@ class RiskManager:
         Returns:
             Tuple of (should_trigger, reason)
         """
+        drawdown, daily_loss_exceeded = self._evaluate_risk_state(equity)
+        
         # Check drawdown
-        if self.peak_equity:
-            drawdown = (self.peak_equity - equity) / self.peak_equity
-            if drawdown > self.max_drawdown:
-                return True, f"Drawdown exceeded: {drawdown:.2%}"
+        if drawdown > self.max_drawdown:
+            return True, f"Drawdown exceeded: {drawdown:.2%}"
         
         # Check daily loss
-        if self.daily_pnl < -abs(equity * self.max_daily_loss):
+        if daily_loss_exceeded:
             return True, f"Daily loss limit exceeded: {self.daily_pnl:.2f}"
         
         # Check error count
@@ -210,6 +210,133 @@ class FeatureCalculator:
         
         return features
     
+    def build_meta_features_batch(
+        self,
+        df: pd.DataFrame,
+        signals: pd.DataFrame,
+        symbol: Optional[str] = None,
+        symbol_encoding: Optional[Dict[str, List[str]]] = None,
+        rows: Optional[np.ndarray] = None,
+        dtype: type = np.float64
+    ) -> pd.DataFrame:
+        """
+        Build meta-model features for every bar in one vectorized pass.
+        
+        Row i holds the features build_meta_features() would return for
+        df.iloc[:i+1] and the primary signal in signals.iloc[i], with the same
+        columns in the same order. Keep the two in sync.
+        
+        Args:
+            df: DataFrame with indicators
+            signals: DataFrame with 'direction' (or int8 'direction_code') and
+                'strength' per bar (from PrimarySignalGenerator.generate_signals_batch)
+            symbol: Trading symbol (optional, used for symbol encoding in multi-symbol mode)
+            symbol_encoding: Dict mapping symbol to one-hot encoding list (optional, used during training)
+            rows: Positional rows to return (optional; default all rows). Only
+                these rows are materialized, in one contiguous block.
+            dtype: dtype of the returned feature values
+            
+        Returns:
+            DataFrame of feature values, indexed like df (or df.index[rows])
+        """
+        if df.empty:
+            return pd.DataFrame(index=df.index)
+        
+        def col(name: str) -> np.ndarray:
+            return df[name].to_numpy(dtype=np.float64)
+        
+        close = col('close')
+        features = {}
+        
+        # Technical indicators
+        if 'rsi' in df.columns:
+            features['rsi'] = col('rsi')
+        
+        if 'macd' in df.columns:
+            features['macd'] = col('macd')
+            features['macd_signal'] = col('macd_signal')
+            features['macd_hist'] = col('macd_hist')
+        
+        if 'ema_9' in df.columns and 'ema_21' in df.columns:
+            ema_9 = col('ema_9')
+            ema_21 = col('ema_21')
+            features['ema_9'] = ema_9
+            features['ema_21'] = ema_21
+            features['ema_9_21_diff'] = (ema_9 - ema_21) / close
+            features['ema_9_21_above'] = np.where(ema_9 > ema_21, 1.0, 0.0)
+        
+        if 'ema_50' in df.columns:
+            ema_50 = col('ema_50')
+            features['ema_50'] = ema_50
+            features['price_above_ema50'] = np.where(close > ema_50, 1.0, 0.0)
+        
+        if 'atr' in df.columns:
+            atr = col('atr')
+            features['atr'] = atr
+            features['atr_pct'] = atr / close
+        
+        if 'bb_width' in df.columns:
+            bb_upper = col('bb_upper')
+            bb_lower = col('bb_lower')
+            features['bb_width'] = col('bb_width')
+            with np.errstate(divide='ignore', invalid='ignore'):
+                features['bb_position'] = (close - bb_lower) / (bb_upper - bb_lower)
+        
+        # Volume features
+        if 'volume_ratio' in df.columns:
+            features['volume_ratio'] = col('volume_ratio')
+        
+        # Return features
+        if 'return_1h' in df.columns:
+            features['return_1h'] = col('return_1h')
+        if 'return_4h' in df.columns:
+            features['return_4h'] = col('return_4h')
+        if 'return_24h' in df.columns:
+            features['return_24h'] = col('return_24h')
+        
+        # Volatility
+        if 'volatility' in df.columns:
+            features['volatility'] = col('volatility')
+        
+        # ADX (trend strength)
+        if 'adx' in df.columns:
+            features['adx'] = col('adx')
+        
+        # Primary signal features
+        features['primary_signal_strength'] = signals['strength'].to_numpy(dtype=np.float64)
+        if 'direction_code' in signals.columns:
+            features['primary_signal_direction'] = signals['direction_code'].to_numpy(dtype=np.float64)
+        else:
+            direction = signals['direction'].to_numpy()
+            features['primary_signal_direction'] = np.where(
+                direction == 'LONG', 1.0, np.where(direction == 'SHORT', -1.0, 0.0)
+            )
+        
+        # Time features
+        if 'timestamp' in df.columns:
+            timestamps = pd.to_datetime(df['timestamp'])
+            features['hour'] = timestamps.dt.hour.to_numpy() / 24.0  # Normalize to [0, 1]
+            features['day_of_week'] = timestamps.dt.dayofweek.to_numpy() / 7.0  # Normalize to [0, 1]
+        
+        # Symbol encoding (for multi-symbol training)
+        if symbol_encoding is not None and symbol is not None:
+            encoding = symbol_encoding.get(symbol, [])
+            for i, val in enumerate(encoding):
+                features[f'symbol_id_{i}'] = np.full(len(df), float(val))
+        elif symbol is not None and 'symbol_id' in df.columns:
+            symbol_id_cols = [c for c in df.columns if c.startswith('symbol_id_')]
+            for c in symbol_id_cols:
+                features[c] = col(c)
+        
+        if rows is None:
+            return pd.DataFrame(features, index=df.index).astype(dtype, copy=False)
+        
+        # Gather only the requested rows, column by column, into one block
+        out = np.empty((len(rows), len(features)), dtype=dtype)
+        for j, values in enumerate(features.values()):
+            out[:, j] = values[rows]
+        return pd.DataFrame(out, columns=list(features), index=df.index[rows])
+    
     def _calculate_rsi(self, prices: pd.Series, period: int = 14) -> pd.Series:
         """Calculate RSI"""
         delta = prices.diff()
@@ -1,7 +1,8 @@
 """Primary trend-following signal generation"""
 
+import numpy as np
 import pandas as pd
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 from loguru import logger
 
 
@@ -87,6 +88,128 @@ class PrimarySignalGenerator:
         else:  # weighted
             return self._combine_weighted(signals, components)
     
+    def generate_signal_array(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Generate primary signal directions for every bar.
+        
+        Args:
+            df: DataFrame with calculated indicators
+            
+        Returns:
+            int8 array with +1 (LONG), -1 (SHORT) or 0 (NEUTRAL) per bar
+        """
+        return self._signal_arrays(df)[0]
+    
+    def generate_signals_batch(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Generate primary signals for every bar in one vectorized pass.
+        
+        Row i holds the signal generate_signal() would return for df.iloc[:i+1]
+        (the same component rules and combination method), without re-slicing
+        the history for each bar. Keep the two in sync.
+        
+        Args:
+            df: DataFrame with calculated indicators
+            
+        Returns:
+            DataFrame indexed like df with columns:
+            'direction' ('LONG', 'SHORT' or 'NEUTRAL'), 'direction_code'
+            (int8 +1/-1/0) and 'strength' (0.0 to 1.0)
+        """
+        codes, strength = self._signal_arrays(df)
+        # Code -1 indexes the last entry, so SHORT maps to 'SHORT'
+        direction = np.array(['NEUTRAL', 'LONG', 'SHORT'], dtype=object)[codes]
+        
+        return pd.DataFrame(
+            {'direction': direction, 'direction_code': codes, 'strength': strength},
+            index=df.index
+        )
+    
+    def _signal_arrays(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Vectorized signal rules; returns (int8 direction codes, strength)"""
+        n = len(df)
+        close = df['close'].to_numpy(dtype=np.float64) if n else np.empty(0)
+        
+        # Per-direction strength sums and vote counts across components
+        long_weight = np.zeros(n)
+        short_weight = np.zeros(n)
+        long_votes = np.zeros(n, dtype=np.int64)
+        short_votes = np.zeros(n, dtype=np.int64)
+        
+        def add_component(is_long: np.ndarray, is_short: np.ndarray, strength: np.ndarray):
+            nonlocal long_weight, short_weight
+            long_weight = long_weight + np.where(is_long, strength, 0.0)
+            short_weight = short_weight + np.where(is_short, strength, 0.0)
+            long_votes[is_long] += 1
+            short_votes[is_short] += 1
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # EMA Crossover
+            if self.config.get('ema_crossover', True) and 'ema_9' in df.columns and 'ema_21' in df.columns:
+                ema_9 = df['ema_9'].to_numpy(dtype=np.float64)
+                ema_21 = df['ema_21'].to_numpy(dtype=np.float64)
+                current_above = ema_9 > ema_21
+                prev_above = np.r_[False, current_above[:-1]]
+                crossover = current_above != prev_above
+                strength = np.minimum(np.abs(ema_9 - ema_21) / close, 0.05) / 0.05
+                strength = np.where(crossover, np.minimum(strength, 1.0), np.minimum(strength * 0.7, 1.0))
+                add_component(current_above, ~current_above, strength)
+            
+            # RSI Extremes
+            if self.config.get('rsi_extremes', True) and 'rsi' in df.columns:
+                oversold = self.config.get('rsi_oversold', 30)
+                overbought = self.config.get('rsi_overbought', 70)
+                rsi = df['rsi'].to_numpy(dtype=np.float64)
+                is_long = rsi < oversold
+                is_short = rsi > overbought
+                strength = np.where(
+                    is_long,
+                    np.minimum((oversold - rsi) / oversold, 1.0),
+                    np.minimum((rsi - overbought) / (100 - overbought), 1.0)
+                )
+                add_component(is_long, is_short, strength)
+            
+            # MACD Crossover
+            if self.config.get('macd_crossover', True) and 'macd' in df.columns and 'macd_signal' in df.columns:
+                macd = df['macd'].to_numpy(dtype=np.float64)
+                macd_signal = df['macd_signal'].to_numpy(dtype=np.float64)
+                macd_hist = df['macd_hist'].to_numpy(dtype=np.float64)
+                current_above = macd > macd_signal
+                prev_above = np.r_[False, current_above[:-1]]
+                cross_up = current_above & ~prev_above
+                cross_down = ~current_above & prev_above
+                cont_long = current_above & prev_above & (macd_hist > 0)
+                cont_short = ~current_above & ~prev_above & (macd_hist < 0)
+                base = np.minimum(np.abs(macd_hist) / (close * 0.01), 1.0)
+                strength = np.where(cross_up | cross_down, np.minimum(base, 1.0), np.minimum(base * 0.7, 1.0))
+                add_component(cross_up | cont_long, cross_down | cont_short, strength)
+            
+            # Combine signals
+            if self.config.get('signal_combination', 'weighted') == 'voting':
+                is_long = long_votes > short_votes
+                is_short = short_votes > long_votes
+                long_strength = long_weight / long_votes
+                short_strength = short_weight / short_votes
+            else:  # weighted
+                num_signals = long_votes + short_votes
+                is_long = long_weight > short_weight
+                is_short = short_weight > long_weight
+                long_strength = long_weight / num_signals
+                short_strength = short_weight / num_signals
+        
+        # Need enough history for indicators (and a previous bar for crossovers)
+        is_long[:49] = False
+        is_short[:49] = False
+        
+        codes = is_long.astype(np.int8) - is_short.astype(np.int8)
+        strength = np.where(
+            is_long,
+            np.minimum(long_strength, 1.0),
+            np.where(is_short, np.minimum(short_strength, 1.0), 0.0)
+        )
+        
+        return codes, strength
+    
     def _ema_crossover_signal(self, latest: pd.Series, df: pd.DataFrame) -> Dict:
         """Generate signal from EMA crossover"""
         if len(df) < 2:
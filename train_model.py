@@ -284,7 +284,8 @@ def main():
             time_barrier_hours=labeling_config.get('time_barrier_hours', 24),
             base_slippage=execution_config.get('base_slippage', 0.0001),
             include_funding=execution_config.get('include_funding', True),
-            funding_rate=execution_config.get('default_funding_rate', 0.0001)
+            funding_rate=execution_config.get('default_funding_rate', 0.0001),
+            n_jobs=model_config.get('prepare_n_jobs', -1)
         )
         
         # Store symbol encoding map in trainer for later use (e.g., saving to config)